@@ -6,13 +6,20 @@ Automatische Cache-Invalidierung bei Model-Änderungen
 import logging
 
 from django.core.cache import cache
+from django.db.models import QuerySet
 from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from accounts.models import Team, TeamMembership
 from optimization.models import OptimizationRun, TeamAssignment
 
-from .cache_utils import EventCacheManager, OptimizationCacheManager, generate_cache_key
+from .cache_utils import (
+    HOME_UPCOMING_EVENTS_KEY,
+    EventCacheManager,
+    OptimizationCacheManager,
+    generate_cache_key,
+)
 from .models import Event, EventOrganizer, TeamRegistration
 
 logger = logging.getLogger(__name__)
@@ -25,6 +32,7 @@ def invalidate_event_cache(sender, instance, **kwargs):
     
     # Event-spezifische Caches invalidieren
     EventCacheManager.invalidate_event_cache(instance.id)
+    cache.delete(HOME_UPCOMING_EVENTS_KEY)
     
     # Event List Caches invalidieren (dynamic import to avoid circular imports)
     try:
@@ -51,6 +59,7 @@ def invalidate_team_registration_cache(sender, instance, **kwargs):
     
     # Event-bezogene Caches invalidieren
     EventCacheManager.invalidate_event_cache(event_id)
+    cache.delete(HOME_UPCOMING_EVENTS_KEY)  # Team-Anzahl auf der Startseite
     
     # Event Detail Base Cache invalidieren (wegen team_count)
     try:
@@ -149,23 +158,66 @@ def invalidate_optimization_cache(sender, instance, **kwargs):
 
 @receiver(post_save, sender=TeamAssignment)
 @receiver(post_delete, sender=TeamAssignment)
-def invalidate_team_assignment_cache(sender, instance, **kwargs):
+def invalidate_team_assignment_cache(sender, instance, origin=None, **kwargs):
     """Invalidiere Team Assignment Caches"""
     
-    optimization_run = instance.optimization_run
-    event_id = optimization_run.event_id
+    # CASCADE beim Löschen von Läufen/Events: der Lauf verschwindet ohnehin und
+    # invalidate_optimization_cache räumt auf - kein UPDATE pro gelöschter Zuweisung
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model in (OptimizationRun, Event):
+        return
+    
+    # Fixtures (raw) und Massen-Schreibpfade: die speichern den Lauf am Ende einmal,
+    # invalidate_optimization_cache übernimmt dann - kein UPDATE pro Zeile
+    if kwargs.get('raw') or getattr(instance, '_skip_cache_invalidation', False):
+        return
+    
+    # Event-ID ohne den FK nachzuladen, wenn der Lauf nicht schon am Objekt hängt
+    run_id = instance.optimization_run_id
+    if TeamAssignment.optimization_run.is_cached(instance):
+        event_id = instance.optimization_run.event_id
+    else:
+        event_id = OptimizationRun.objects.filter(pk=run_id).values_list(
+            'event_id', flat=True).first()
     
     # Assignment-spezifische Caches invalidieren
     OptimizationCacheManager.set_team_assignments(event_id, None, instance.course)
     OptimizationCacheManager.set_team_assignments(event_id, None)
     
-    # Optimization Results Cache invalidieren  
-    from .views import get_cached_optimization_results_data
-    get_cached_optimization_results_data.clear_cache(event_id, optimization_run.id)
+    # Optimization Results Cache invalidieren: updated_at des Laufs steckt im Cache-Key.
+    # .update() statt save(), damit keine OptimizationRun-Signale ausgelöst werden
+    OptimizationRun.objects.filter(pk=run_id).update(updated_at=timezone.now())
     
     logger.info(f"🗑️ Team assignment cache invalidated for event {event_id}")
 
 
+@receiver(m2m_changed, sender=TeamAssignment.guests.through)
+def invalidate_team_assignment_guests_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidiere Team Assignment Caches bei Änderungen der Gäste (M2M)"""
+    
+    if reverse:
+        # instance ist das Gast-Team - bei clear die Zuweisungen vorher ermitteln
+        if action not in ('post_add', 'post_remove', 'pre_clear'):
+            return
+        assignments = (TeamAssignment.objects.filter(pk__in=pk_set) if pk_set
+                       else instance.guest_assignments.all())
+    else:
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        assignments = TeamAssignment.objects.filter(pk=instance.pk)
+    
+    runs = OptimizationRun.objects.filter(
+        pk__in=assignments.values('optimization_run_id'))
+    event_ids = set(runs.values_list('event_id', flat=True))
+    
+    # updated_at steckt im Cache-Key der Optimization Results
+    runs.update(updated_at=timezone.now())
+    for event_id in event_ids:
+        OptimizationCacheManager.set_team_assignments(event_id, None)
+    
+    logger.info(f"🗑️ Team assignment guests cache invalidated for events {sorted(event_ids)}")
+
+
 @receiver(post_save, sender=EventOrganizer)
 @receiver(post_delete, sender=EventOrganizer)
 def invalidate_event_organizer_cache(sender, instance, **kwargs):
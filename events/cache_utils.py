@@ -26,6 +26,10 @@ CACHE_TIMEOUTS = {
     'geographic_queries': 900,     # 15 Minuten - Geo-Abfragen
 }
 
+# Startseite: nächste öffentliche Events (Invalidierung in cache_signals)
+HOME_UPCOMING_EVENTS_KEY = 'home_upcoming_events_v1'
+HOME_UPCOMING_EVENTS_TIMEOUT = 60
+
 # Cache Key Prefixes für bessere Organisation
 CACHE_PREFIXES = {
     'event': 'evt',
@@ -343,3 +347,25 @@ def get_cache_stats() -> dict:
     except Exception as e:
         logger.error(f"❌ Failed to get cache stats: {e}")
         return {}
+
+
+def optimization_progress_channel(event_id: int) -> str:
+    """Redis Pub/Sub Channel für Live-Progress einer Optimierung"""
+    return f"opt_progress:{event_id}"
+
+
+def publish_optimization_progress(event_id: int, progress: dict, logs: list = None):
+    """
+    Pusht ein Progress-Update an verbundene SSE-Clients (Redis Pub/Sub)
+    Der Cache-Eintrag bleibt für Polling und spät verbundene Clients die Quelle
+    """
+    try:
+        from django_redis import get_redis_connection
+        redis_conn = get_redis_connection("default")
+        redis_conn.publish(
+            optimization_progress_channel(event_id),
+            json.dumps({'progress': progress, 'logs': logs or []}, default=str),
+        )
+    except Exception as e:
+        # Kein Redis (LocMem-Fallback) - Clients lesen weiterhin aus dem Cache
+        logger.debug(f"Progress publish skipped for event {event_id}: {e}")
@@ -8,7 +8,7 @@ from datetime import timedelta
 from decimal import Decimal
 from accounts.models import CustomUser, Team, TeamMembership, DietaryRestriction
 from events.models import Event, TeamRegistration
-from optimization.models import OptimizationRun, TeamAssignment
+from optimization.models import OptimizationRun, OptimizationRunLog, TeamAssignment
 
 
 class Command(BaseCommand):
@@ -247,8 +247,9 @@ class Command(BaseCommand):
                 started_at=timezone.now() - timedelta(minutes=30),
                 completed_at=timezone.now() - timedelta(minutes=25),
                 total_distance=Decimal(str(random.uniform(50.0, 200.0))),
-                log_data={'test': 'performance test data'}
             )
+            OptimizationRunLog.objects.create(
+                run=optimization_run, data={'test': 'performance test data'})
 
             # Create team assignments
             confirmed_teams = list(
@@ -275,7 +276,6 @@ class Command(BaseCommand):
                     distance_to_main_course=Decimal(
                         str(random.uniform(0.5, 5.0))),
                     distance_to_dessert=Decimal(str(random.uniform(0.5, 5.0))),
-                    total_distance=Decimal(str(random.uniform(2.0, 15.0))),
                 )
                 assignment_count += 1
 
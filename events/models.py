@@ -149,53 +149,53 @@ class Event(models.Model):
         from accounts.models import CustomUser
         return CustomUser.objects.filter(id__in=all_ids)
 
+    def _is_main_organizer(self, user):
+        """Prüft ohne zusätzliche Query ob ein User der Haupt-Organisator ist"""
+        return user.pk is not None and user.pk == self.organizer_id
+
+    def _get_organizer_role_obj(self, user):
+        """
+        Holt die aktive EventOrganizer-Rolle eines Users
+        Pro Event-Instanz gecacht, damit mehrere Berechtigungsprüfungen
+        im selben Request nur eine Query auslösen
+        """
+        role_cache = self.__dict__.setdefault('_organizer_role_cache', {})
+        if user.pk not in role_cache:
+            role_cache[user.pk] = EventOrganizer.objects.filter(
+                event=self, user_id=user.pk, is_active=True).first() if user.pk else None
+        return role_cache[user.pk]
+
     def can_user_manage_event(self, user):
         """Prüft ob ein User das Event verwalten kann"""
-        if user == self.organizer:
+        if self._is_main_organizer(user):
             return True
 
-        try:
-            organizer_role = EventOrganizer.objects.get(
-                event=self, user=user, is_active=True)
-            return organizer_role.can_manage_event
-        except EventOrganizer.DoesNotExist:
-            return False
+        organizer_role = self._get_organizer_role_obj(user)
+        return organizer_role.can_manage_event if organizer_role else False
 
     def can_user_manage_teams(self, user):
         """Prüft ob ein User Teams verwalten kann"""
-        if user == self.organizer:
+        if self._is_main_organizer(user):
             return True
 
-        try:
-            organizer_role = EventOrganizer.objects.get(
-                event=self, user=user, is_active=True)
-            return organizer_role.can_manage_teams
-        except EventOrganizer.DoesNotExist:
-            return False
+        organizer_role = self._get_organizer_role_obj(user)
+        return organizer_role.can_manage_teams if organizer_role else False
 
     def can_user_run_optimization(self, user):
         """Prüft ob ein User die Optimierung starten kann"""
-        if user == self.organizer:
+        if self._is_main_organizer(user):
             return True
 
-        try:
-            organizer_role = EventOrganizer.objects.get(
-                event=self, user=user, is_active=True)
-            return organizer_role.can_run_optimization
-        except EventOrganizer.DoesNotExist:
-            return False
+        organizer_role = self._get_organizer_role_obj(user)
+        return organizer_role.can_run_optimization if organizer_role else False
 
     def get_organizer_role(self, user):
         """Gibt die Rolle eines Users für dieses Event zurück"""
-        if user == self.organizer:
+        if self._is_main_organizer(user):
             return 'main_organizer'
 
-        try:
-            organizer_role = EventOrganizer.objects.get(
-                event=self, user=user, is_active=True)
-            return organizer_role.role
-        except EventOrganizer.DoesNotExist:
-            return None
+        organizer_role = self._get_organizer_role_obj(user)
+        return organizer_role.role if organizer_role else None
 
     @property
     def organizer_count(self):
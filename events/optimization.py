@@ -6,10 +6,13 @@ Basiert auf dem Ansatz von https://github.com/fm-or/running-dinner
 import random
 from typing import List, Dict, Tuple, Optional
 from django.utils import timezone
+import numpy as np
 import pulp
 import logging
 from django.core.cache import cache
 
+from .cache_utils import publish_optimization_progress
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +31,10 @@ class RunningDinnerOptimizer:
         self.teams = []
         self.team_registrations = []
         self.distances = {}  # Simulierte Entfernungen
+        self.team_index = {}  # team.id → Zeile/Spalte in self.D
+        self.D = None  # Entfernungsmatrix (numpy) für vektorisierte Suche
         self.courses = ['appetizer', 'main_course', 'dessert']
+        self.course_index = {course: k for k, course in enumerate(self.courses)}
         self.k = 3  # Anzahl Teams pro Event (Host + 2 Gäste)
 
         # Progress-Tracking für Live-Updates
@@ -43,15 +49,17 @@ class RunningDinnerOptimizer:
 
     def _init_progress(self):
         """Initialisiere Progress-Tracking"""
-        cache.set(self.progress_key, {
+        progress = {
             'step': 0,
             'total_steps': 5,
             'current_task': 'Starte Optimierung...',
             'percentage': 0,
             'status': 'running'
-        }, timeout=300)  # 5 Minuten Cache
+        }
+        cache.set(self.progress_key, progress, timeout=300)  # 5 Minuten Cache
 
         cache.set(self.log_key, [], timeout=300)
+        publish_optimization_progress(self.event.id, progress)
 
     def _update_progress(self, step: int, total_steps: int, task: str, details: str = None):
         """Update Progress für Live-Anzeige"""
@@ -81,6 +89,7 @@ class RunningDinnerOptimizer:
         if len(logs) > 50:
             logs = logs[-50:]
         cache.set(self.log_key, logs, timeout=300)
+        publish_optimization_progress(self.event.id, progress, logs)
 
     def load_teams(self):
         """Lade bestätigte Teams für das Event und zusätzliche Features"""
@@ -138,6 +147,8 @@ class RunningDinnerOptimizer:
         Berechne echte Fußgänger-Entfernungen zwischen allen Teams
         Verwendet OpenRouteService API für realistische Routen
         """
+        from optimization.distance_cache import get_matrix
+
         from .routing import get_route_calculator
 
         n = len(self.teams)
@@ -145,9 +156,15 @@ class RunningDinnerOptimizer:
                               f"🗺️ Berechne echte Fußgänger-Routen für {n} Teams...")
         logger.info(f"🗺️ Berechne echte Fußgänger-Routen für {n} Teams...")
 
-        # Verwende echtes Routing
+        # Verwende echtes Routing - Matrix event-weit gecacht (optimization.distance_cache)
         route_calculator = get_route_calculator()
-        self.distances = route_calculator.calculate_team_distances(self.teams)
+        self.D = get_matrix(self.event, self.teams)
+        self.team_index = {team.id: i for i, team in enumerate(self.teams)}
+        self.distances = {
+            (team1.id, team2.id): float(self.D[i, j])
+            for i, team1 in enumerate(self.teams)
+            for j, team2 in enumerate(self.teams)
+        }
 
         # Distanzen zu Gastküchen
         self.guest_kitchen_distances = {}
@@ -204,21 +221,6 @@ class RunningDinnerOptimizer:
                         kitchen_coords, afterparty_coords)
                     self.after_party_distances[f'kitchen_{kitchen.id}'] = distance
 
-        # Validierung: Prüfe ob alle Entfernungen vorhanden sind
-        missing_distances = 0
-        for i, team1 in enumerate(self.teams):
-            for j, team2 in enumerate(self.teams):
-                if (team1.id, team2.id) not in self.distances:
-                    logger.warning(
-                        f"⚠️ Fehlende Entfernung: {team1.name} → {team2.name}")
-                    # Fallback-Entfernung
-                    self.distances[(team1.id, team2.id)] = 2.5
-                    missing_distances += 1
-
-        if missing_distances > 0:
-            logger.warning(
-                f"⚠️ {missing_distances} Entfernungen mit Fallback-Werten ergänzt")
-
         # Statistiken
         all_distances = [d for d in self.distances.values() if d > 0]
         if all_distances:
@@ -389,14 +391,51 @@ class RunningDinnerOptimizer:
 
         logger.info("✅ Alle Constraints hinzugefügt")
 
-    def solve(self) -> bool:
+    def apply_warm_start(self) -> bool:
+        """
+        Setze Startwerte für x aus dem letzten abgeschlossenen Lauf des Events
+        CBC startet dann mit einer zulässigen Lösung statt bei Null
+        """
+        from optimization.models import OptimizationRun, TeamAssignment
+
+        prior_run_id = OptimizationRun.objects.filter(
+            event=self.event, status='completed'
+        ).order_by('-completed_at').values_list('id', flat=True).first()
+        if prior_run_id is None:
+            return False
+
+        host_fields = [f'hosts_{course}_id' for course in self.courses]
+        prior_hosts = {
+            row[0]: row[1:]
+            for row in TeamAssignment.objects.filter(
+                optimization_run_id=prior_run_id
+            ).values_list('team_id', *host_fields)
+        }
+
+        # Nur verwenden wenn der frühere Lauf alle aktuellen Teams vollständig abdeckt
+        for team in self.teams:
+            hosts = prior_hosts.get(team.id)
+            if hosts is None or any(host_id not in self.team_index for host_id in hosts):
+                logger.info("♻️ Kein Warmstart: Teams haben sich seit dem letzten Lauf geändert")
+                return False
+
+        for i, team in enumerate(self.teams):
+            for k, host_id in enumerate(prior_hosts[team.id]):
+                host_j = self.team_index[host_id]
+                for j in range(len(self.teams)):
+                    self.x[(i, j, k)].setInitialValue(1 if j == host_j else 0)
+
+        logger.info(f"♻️ Warmstart aus OptimizationRun {prior_run_id}")
+        return True
+
+    def solve(self, warm_start: bool = False) -> bool:
         """Löse das MIP-Problem mit Fallback-Strategien"""
         logger.info("🚀 Starte MIP-Optimierung...")
 
         # Versuche verschiedene Solver und Einstellungen
         solvers = [
-            (pulp.PULP_CBC_CMD(msg=0, timeLimit=30), "CBC"),
-            (pulp.PULP_COIN_CMD(msg=0, timeLimit=30), "COIN"),
+            (pulp.PULP_CBC_CMD(msg=0, timeLimit=30, warmStart=warm_start), "CBC"),
+            (pulp.PULP_COIN_CMD(msg=0, timeLimit=30, warmStart=warm_start), "COIN"),
         ]
 
         for solver, name in solvers:
@@ -446,6 +485,15 @@ class RunningDinnerOptimizer:
         n_teams = len(self.teams)
         n_courses = len(self.courses)
 
+        # Alle x-Werte einmal als Tensor [Gast i, Host j, Kurs k] auslesen -
+        # Zuweisungen und Hosting werden danach auf dem Array ausgewertet
+        X = np.array([
+            [[pulp.value(self.x[(i, j, k)]) for k in range(n_courses)]
+             for j in range(n_teams)]
+            for i in range(n_teams)
+        ], dtype=np.float64).reshape(n_teams, n_teams, n_courses)
+        assigned = X == 1
+
         # Extrahiere Team-Zuweisungen
         for i, team in enumerate(self.teams):
             assignment = {
@@ -457,29 +505,30 @@ class RunningDinnerOptimizer:
             }
 
             for k, course in enumerate(self.courses):
-                for j, host_team in enumerate(self.teams):
-                    if pulp.value(self.x[(i, j, k)]) == 1:
-                        assignment['hosts'][course] = host_team
-                        assignment['distances'][course] = self.distances[(
-                            team.id, host_team.id)]
+                host_indices = np.flatnonzero(assigned[i, :, k])
+                if host_indices.size == 0:
+                    continue
+                j = int(host_indices[-1])
+                host_team = self.teams[j]
+                assignment['hosts'][course] = host_team
+                assignment['distances'][course] = self.distances[(
+                    team.id, host_team.id)]
 
-                        # Prüfe ob Team sich selbst hostet
-                        if i == j:
-                            assignment['course_hosted'] = course
+                # Prüfe ob Team sich selbst hostet
+                if assigned[i, i, k]:
+                    assignment['course_hosted'] = course
 
             assignment['total_distance'] = sum(
                 assignment['distances'].values())
             solution['assignments'].append(assignment)
 
         # Extrahiere Hosting-Information
+        # Team j hostet Kurs k wenn es Gäste hat (Host + Gäste)
+        guest_counts = X.sum(axis=0)  # [Host j, Kurs k]
         for k, course in enumerate(self.courses):
-            solution['hosting'][course] = []
-            for j, team in enumerate(self.teams):
-                # Team j hostet Kurs k wenn es Gäste hat
-                guest_count = sum([pulp.value(self.x[(i, j, k)])
-                                  for i in range(n_teams)])
-                if guest_count > 1:  # Host + Gäste
-                    solution['hosting'][course].append(team.id)
+            solution['hosting'][course] = [
+                self.teams[j].id for j in np.flatnonzero(guest_counts[:, k] > 1)
+            ]
 
         # Extrahiere Reisezeiten
         for k, course in enumerate(self.courses):
@@ -675,8 +724,18 @@ class RunningDinnerOptimizer:
         self._update_progress(3, 5, "Diversitäts-Optimierung",
                               f"Optimiere {len(self.teams)} Teams für maximale Vielfalt")
 
-        # Track alle Team-Begegnungen: team_pair -> anzahl_treffen
-        team_meetings = {}
+        if self.D is None:
+            self._build_distance_matrix()
+        D = self.D
+        index = self.team_index
+
+        # Track alle Team-Begegnungen als symmetrische Matrix: [i, j] -> anzahl_treffen
+        meetings = np.zeros((len(self.teams), len(self.teams)), dtype=np.int32)
+
+        # Gehosteter Kurs je Team als Code 0/1/2 (-1 = hostet nicht) statt String-Vergleichen
+        hosted_course = np.fromiter(
+            (self.course_index.get(team_hosting_map.get(t.id), -1) for t in self.teams),
+            dtype=np.int8, count=len(self.teams))
 
         # Initialisiere Gäste-Listen für jeden Host
         guests_per_host = {}  # host_team_id -> [guest_team_objects]
@@ -692,76 +751,70 @@ class RunningDinnerOptimizer:
                 f"🍽️ Optimiere {course_display}-Zuordnungen für Diversität...")
 
             host_teams = host_teams_by_course[course]
-            guest_teams = [
-                t for t in self.teams if team_hosting_map[t.id] != course]
+            guest_teams = [self.teams[i] for i in np.flatnonzero(
+                hosted_course != self.course_index[course])]
 
             # Ziel: Verteile guest_teams auf host_teams mit maximaler Diversität
             # Standard: 2 Gäste pro Host (bei 12 Teams, 4 Hosts = 8 Gäste → 2 pro Host)
             guests_per_host_target = len(guest_teams) // len(host_teams)
             extra_guests = len(guest_teams) % len(host_teams)
 
+            # Kurs-Zustand als Arrays: Host-Indizes, Zielgröße, aktuelle Gäste (0/1-Matrix)
+            host_idx = np.fromiter((index[h.id] for h in host_teams),
+                                   dtype=np.int32, count=len(host_teams))
+            target_counts = np.full(len(host_teams), guests_per_host_target, dtype=np.int32)
+            target_counts[:extra_guests] += 1
+            guest_counts = np.array([len(guests_per_host[h.id]) for h in host_teams], dtype=np.int32)
+            host_members = np.zeros((len(host_teams), len(self.teams)), dtype=np.int32)
+            for h, host_team in enumerate(host_teams):
+                for existing_guest in guests_per_host[host_team.id]:
+                    host_members[h, index[existing_guest.id]] = 1
+
             # Greedy-Algorithmus: Für jeden Gast finde besten Host
             guest_teams_copy = guest_teams.copy()
             random.shuffle(guest_teams_copy)  # Randomisierung für Fairness
 
             for guest_team in guest_teams_copy:
-                best_host = None
-                best_score = float('inf')
-
-                for host_team in host_teams:
-                    current_guest_count = len(guests_per_host[host_team.id])
-                    target_guest_count = guests_per_host_target + \
-                        (1 if host_teams.index(host_team) < extra_guests else 0)
-
-                    # Skip wenn Host bereits voll
-                    if current_guest_count >= target_guest_count:
-                        continue
-
-                    # Berechne Diversitäts-Score
-                    diversity_penalty = 0
-                    for existing_guest in guests_per_host[host_team.id]:
-                        # Prüfe ob guest_team und existing_guest sich bereits getroffen haben
-                        pair_key = tuple(
-                            sorted([guest_team.id, existing_guest.id]))
-                        meetings_count = team_meetings.get(pair_key, 0)
-                        diversity_penalty += meetings_count * 1000  # Hohe Strafe für Wiederholungen
-
-                        # Prüfe auch mit dem Host selbst
-                        host_pair_key = tuple(
-                            sorted([guest_team.id, host_team.id]))
-                        host_meetings = team_meetings.get(host_pair_key, 0)
-                        diversity_penalty += host_meetings * 1000
-
-                    # Berechne Distanz-Score (geringere Gewichtung)
-                    distance_score = self.distances.get(
-                        (guest_team.id, host_team.id), 0) * 1  # Niedrige Gewichtung
-
-                    # Gesamt-Score: Diversität >> Distanz
-                    total_score = diversity_penalty + distance_score
-
-                    if total_score < best_score:
-                        best_score = total_score
-                        best_host = host_team
-
-                if best_host:
-                    guests_per_host[best_host.id].append(guest_team)
-
-                    # Update Meeting-Tracker
-                    for existing_guest in guests_per_host[best_host.id]:
-                        if existing_guest.id != guest_team.id:
-                            pair_key = tuple(
-                                sorted([guest_team.id, existing_guest.id]))
-                            team_meetings[pair_key] = team_meetings.get(
-                                pair_key, 0) + 1
-
-                    # Meeting mit Host tracken
-                    host_pair_key = tuple(
-                        sorted([guest_team.id, best_host.id]))
-                    team_meetings[host_pair_key] = team_meetings.get(
-                        host_pair_key, 0) + 1
-
-                    logger.debug(
-                        f"   👥 {guest_team.name} → {best_host.name} (Score: {best_score:.1f})")
+                g = index[guest_team.id]
+                meet_row = meetings[g]
+
+                # Diversitäts-Score für alle Hosts auf einmal: Begegnungen mit den
+                # vorhandenen Gästen + Begegnung mit dem Host je vorhandenem Gast
+                diversity_penalty = 1000 * (host_members @ meet_row +
+                                            guest_counts * meet_row[host_idx])
+                # Distanz-Score (geringere Gewichtung) - Gesamt-Score: Diversität >> Distanz
+                scores = diversity_penalty + D[g, host_idx]
+                # Skip wenn Host bereits voll
+                scores = np.where(guest_counts >= target_counts, np.inf, scores)
+
+                best = int(np.argmin(scores))
+                best_score = scores[best]
+                if not np.isfinite(best_score):
+                    continue
+                best_host = host_teams[best]
+
+                # Update Meeting-Tracker (mit allen vorhandenen Gästen und dem Host)
+                partners = np.flatnonzero(host_members[best])
+                meetings[g, partners] += 1
+                meetings[partners, g] += 1
+                h = host_idx[best]
+                meetings[g, h] += 1
+                meetings[h, g] += 1
+
+                guests_per_host[best_host.id].append(guest_team)
+                host_members[best, g] = 1
+                guest_counts[best] += 1
+
+                logger.debug(
+                    f"   👥 {guest_team.name} → {best_host.name} (Score: {best_score:.1f})")
+
+        # Begegnungen zurück ins bisherige Format: (team_id, team_id) -> anzahl_treffen
+        team_ids = [team.id for team in self.teams]
+        rows, cols = np.nonzero(np.triu(meetings, k=1))
+        team_meetings = {
+            tuple(sorted((team_ids[i], team_ids[j]))): int(meetings[i, j])
+            for i, j in zip(rows, cols)
+        }
 
         # Speichere optimierte Zuordnungen in solution
         solution['guests_per_host'] = guests_per_host
@@ -999,6 +1052,15 @@ class RunningDinnerOptimizer:
 
         return solution
 
+    def _build_distance_matrix(self):
+        """Entfernungen einmalig als float32-Matrix für vektorisierte Auswertung"""
+        self.team_index = {team.id: i for i, team in enumerate(self.teams)}
+        team_ids = [team.id for team in self.teams]
+        self.D = np.array(
+            [[self.distances[(id1, id2)] for id2 in team_ids] for id1 in team_ids],
+            dtype=np.float32,
+        ).reshape(len(team_ids), len(team_ids))
+
     def improve_guest_distribution(self, solution, guests_per_host, host_teams_by_course):
         """
         Post-Optimierung: Verbessere Gästeverteilung und Gesamtdistanzen
@@ -1007,6 +1069,22 @@ class RunningDinnerOptimizer:
         courses = self.courses
         n_teams = len(self.teams)
         improved_assignments = solution['assignments'].copy()
+        assignment_by_team = {a['team'].id: a for a in improved_assignments}
+
+        if self.D is None:
+            self._build_distance_matrix()
+        D = self.D
+
+        # Gästezahl pro Kurs ist unter Verschiebungen invariant - einmal berechnen
+        total_guests_by_course = {
+            course: sum(1 for a in improved_assignments
+                        if a['team'].id in self.team_index
+                        and a['course_hosted'] != course and a['hosts'].get(course))
+            for course in courses
+        }
+        # Gesamtdistanz wird per Delta mitgeführt statt neu summiert
+        current_total_distance = sum(a['total_distance']
+                                     for a in improved_assignments)
 
         # Mehrere Optimierungsiterationen
         # Flexibel konfigurierbar
@@ -1021,10 +1099,8 @@ class RunningDinnerOptimizer:
                     continue
 
                 # Berechne ideale Gästeanzahl pro Host
-                total_guests_for_course = sum(1 for t in self.teams if
-                                              any(a['course_hosted'] != course and a['hosts'].get(course)
-                                                  for a in improved_assignments if a['team'].id == t.id))
-                ideal_guests = total_guests_for_course / len(hosts_in_course)
+                ideal_guests = total_guests_by_course[course] / \
+                    len(hosts_in_course)
 
                 # Finde unausgewogene Hosts
                 overloaded_hosts = []
@@ -1045,22 +1121,18 @@ class RunningDinnerOptimizer:
                         best_guest_to_move = None
                         best_improvement = 0
 
-                        current_guests = guests_per_host[overloaded_host.id].copy(
-                        )
-                        for guest_team in current_guests:
-
-                            # Berechne aktuelle Distanz
-                            old_distance = self.distances[(
-                                guest_team.id, overloaded_host.id)]
-                            new_distance = self.distances[(
-                                guest_team.id, underloaded_host.id)]
-
-                            # Improvement = Distanzreduktion
-                            distance_improvement = old_distance - new_distance
-
-                            if distance_improvement > best_improvement:
-                                best_improvement = distance_improvement
-                                best_guest_to_move = guest_team
+                        current_guests = guests_per_host[overloaded_host.id]
+                        if current_guests:
+                            # Improvement = Distanzreduktion, für alle Gäste auf einmal
+                            guest_idx = np.fromiter(
+                                (self.team_index[g.id] for g in current_guests),
+                                dtype=np.int32, count=len(current_guests))
+                            improvements = (D[guest_idx, self.team_index[overloaded_host.id]] -
+                                            D[guest_idx, self.team_index[underloaded_host.id]])
+                            best = int(np.argmax(improvements))
+                            if improvements[best] > 0:
+                                best_improvement = float(improvements[best])
+                                best_guest_to_move = current_guests[best]
 
                         # Führe die beste Verschiebung durch
                         if best_guest_to_move and best_improvement > 0.1:  # Min. 100m Verbesserung
@@ -1074,14 +1146,15 @@ class RunningDinnerOptimizer:
                                 best_guest_to_move)
 
                             # Update assignments
-                            for assignment in improved_assignments:
-                                if assignment['team'].id == best_guest_to_move.id:
-                                    old_distance = assignment['distances'][course]
-                                    assignment['hosts'][course] = underloaded_host
-                                    assignment['distances'][course] = new_distance
-                                    assignment['total_distance'] += (
-                                        new_distance - old_distance)
-                                    break
+                            assignment = assignment_by_team[best_guest_to_move.id]
+                            old_distance = assignment['distances'][course]
+                            new_distance = self.distances[(
+                                best_guest_to_move.id, underloaded_host.id)]
+                            assignment['hosts'][course] = underloaded_host
+                            assignment['distances'][course] = new_distance
+                            assignment['total_distance'] += (
+                                new_distance - old_distance)
+                            current_total_distance += new_distance - old_distance
 
                             improvement_found = True
                             break
@@ -1094,8 +1167,7 @@ class RunningDinnerOptimizer:
                 break
 
         # Berechne finale Statistiken
-        new_total_distance = sum(a['total_distance']
-                                 for a in improved_assignments)
+        new_total_distance = current_total_distance
         old_total_distance = solution['objective_value']
         improvement = old_total_distance - new_total_distance
 
@@ -1287,7 +1359,9 @@ class RunningDinnerOptimizer:
                 'hosts': hosts,
                 'course_hosted': assignment.course,
                 'distances': distances,
-                'total_distance': assignment.total_distance or 0
+                'total_distance': assignment.total_distance or 0,
+                # Afterparty-Strecke ist Teil von total_distance (GeneratedField) - mitführen
+                'distance_to_afterparty': assignment.distance_to_afterparty or 0
             }
 
             solution_assignments.append(solution_assignment)
@@ -1329,11 +1403,18 @@ class RunningDinnerOptimizer:
 
     def _update_existing_assignments(self, optimized_solution, optimization_run):
         """Aktualisiere bestehende TeamAssignment-Objekte mit neuen Werten"""
+        run_total_distance = 0
+        assignments_by_team = {
+            assignment.team_id: assignment
+            for assignment in optimization_run.team_assignments.all()
+        }
         for solution_assignment in optimized_solution['assignments']:
             team = solution_assignment['team']
 
             # Finde das entsprechende TeamAssignment
-            assignment = optimization_run.assignments.get(team=team)
+            assignment = assignments_by_team[team.id]
+            # Caches invalidiert optimization_run.save() unten einmal für alle Zeilen
+            assignment._skip_cache_invalidation = True
 
             # Update hosts
             assignment.hosts_appetizer = solution_assignment['hosts']['appetizer']
@@ -1344,12 +1425,20 @@ class RunningDinnerOptimizer:
             assignment.distance_to_appetizer = solution_assignment['distances']['appetizer']
             assignment.distance_to_main_course = solution_assignment['distances']['main_course']
             assignment.distance_to_dessert = solution_assignment['distances']['dessert']
-            assignment.total_distance = solution_assignment['total_distance']
+            # Neu berechnete Afterparty-Route, sonst bisherigen Wert behalten
+            afterparty_route = solution_assignment.get('afterparty_route')
+            if afterparty_route:
+                assignment.distance_to_afterparty = afterparty_route['distance']
+            else:
+                assignment.distance_to_afterparty = solution_assignment.get(
+                    'distance_to_afterparty', assignment.distance_to_afterparty)
 
             assignment.save()
+            run_total_distance += (sum(solution_assignment['distances'].values())
+                                   + (assignment.distance_to_afterparty or 0))
 
-        # Update optimization run statistics
-        optimization_run.total_distance = optimized_solution['objective_value']
+        # Update optimization run statistics - gleiche Summe wie total_distance der Zuweisungen
+        optimization_run.total_distance = round(run_total_distance, 1)
         optimization_run.save()
 
     def optimize(self) -> Dict:
@@ -1374,8 +1463,8 @@ class RunningDinnerOptimizer:
                     # 4. Füge Constraints hinzu
                     self.add_constraints()
 
-                    # 5. Löse Problem
-                    if self.solve():
+                    # 5. Löse Problem - mit Startlösung aus dem letzten Lauf, falls vorhanden
+                    if self.solve(warm_start=self.apply_warm_start()):
                         solution = self.extract_solution()
                         logger.info("🎉 MIP-Optimierung erfolgreich!")
                         return solution
@@ -74,6 +74,12 @@ class RouteCalculator:
         """
         start_lat, start_lng = start_coords
         end_lat, end_lng = end_coords
+
+        # Cache für Geometrien (~1m Auflösung), event-übergreifend wiederverwendbar
+        cache_key = f"walkgeom:{start_lat:.5f}:{start_lng:.5f}:{end_lat:.5f}:{end_lng:.5f}"
+        cached_points = cache.get(cache_key)
+        if cached_points:
+            return cached_points
         
         try:
             # Rate Limiting
@@ -102,6 +108,7 @@ class RouteCalculator:
                         geometry = result['routes'][0]['geometry']['coordinates']
                         # Konvertiere [lng, lat] zu [lat, lng] für Leaflet
                         route_points = [[point[1], point[0]] for point in geometry]
+                        cache.set(cache_key, route_points, 3600 * 24 * 30)  # 30 Tage
                         logger.info(f"🗺️ Route-Geometrie: {len(route_points)} Punkte")
                         return route_points
                         
@@ -116,6 +123,7 @@ class RouteCalculator:
                 if 'routes' in result and len(result['routes']) > 0:
                     geometry = result['routes'][0]['geometry']['coordinates']
                     route_points = [[point[1], point[0]] for point in geometry]
+                    cache.set(cache_key, route_points, 3600 * 24 * 30)  # 30 Tage
                     logger.info(f"🗺️ OSRM Route-Geometrie: {len(route_points)} Punkte")
                     return route_points
             
@@ -1,3 +1,163 @@
+from datetime import timedelta
+from decimal import Decimal
+
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser, Team
+from optimization.models import OptimizationRun, TeamAssignment
+
+from .models import Event, TeamRegistration
+
+
+def create_event(organizer, **kwargs):
+    """Öffentliches Event mit offener Anmeldung"""
+    defaults = {
+        'name': 'Test Event',
+        'description': 'Running Dinner für Tests',
+        'organizer': organizer,
+        'event_date': timezone.now().date() + timedelta(days=30),
+        'registration_start': timezone.now() - timedelta(days=10),
+        'registration_deadline': timezone.now() + timedelta(days=20),
+        'max_teams': 50,
+        'team_size': 2,
+        'groups_per_course': 3,
+        'price_per_person': Decimal('25.00'),
+        'city': 'Munich',
+        'max_distance_km': Decimal('15.00'),
+        'status': 'registration_open',
+        'is_public': True,
+    }
+    defaults.update(kwargs)
+    return Event.objects.create(**defaults)
+
+
+def create_team(contact_person, index):
+    return Team.objects.create(
+        name=f'TestTeam{index:04d}',
+        contact_person=contact_person,
+        home_address=f'Teststraße {index}, München',
+        latitude=Decimal('48.1351000'),
+        longitude=Decimal('11.5820000'),
+    )
+
+
+class BulkUpdateTeamStatusTests(TestCase):
+    """Sammel-Statusänderung der Anmeldungen"""
+
+    def setUp(self):
+        self.organizer = CustomUser.objects.create_user(
+            username='organizer', email='organizer@test.com', password='testpass123')
+        self.event = create_event(self.organizer)
+        self.registrations = [
+            TeamRegistration.objects.create(
+                event=self.event, team=create_team(self.organizer, i), status='pending')
+            for i in range(3)
+        ]
+        self.url = reverse('events:bulk_update_team_status', args=[self.event.id])
+        self.client.force_login(self.organizer)
+
+    def _statuses(self):
+        return set(TeamRegistration.objects.filter(
+            event=self.event).values_list('status', flat=True))
+
+    def test_valid_status_updates_selected_registrations(self):
+        selected = self.registrations[:2]
+        response = self.client.post(self.url, {
+            'status': 'confirmed',
+            'registration_ids': [str(reg.id) for reg in selected],
+        })
+
+        self.assertRedirects(
+            response, reverse('events:manage_event', args=[self.event.id]),
+            fetch_redirect_response=False)
+        for reg in selected:
+            reg.refresh_from_db()
+            self.assertEqual(reg.status, 'confirmed')
+        self.registrations[2].refresh_from_db()
+        self.assertEqual(self.registrations[2].status, 'pending')
+
+    def test_invalid_status_is_rejected(self):
+        self.client.post(self.url, {
+            'status': 'not_a_status',
+            'registration_ids': [str(reg.id) for reg in self.registrations],
+        })
+
+        self.assertEqual(self._statuses(), {'pending'})
+
+    def test_non_numeric_ids_are_ignored(self):
+        self.client.post(self.url, {
+            'status': 'confirmed',
+            'registration_ids': ['abc', '1; DROP TABLE'],
+        })
+
+        self.assertEqual(self._statuses(), {'pending'})
+
+    def test_other_users_cannot_update(self):
+        other = CustomUser.objects.create_user(
+            username='other', email='other@test.com', password='testpass123')
+        self.client.force_login(other)
+
+        self.client.post(self.url, {
+            'status': 'confirmed',
+            'registration_ids': [str(reg.id) for reg in self.registrations],
+        })
+
+        self.assertEqual(self._statuses(), {'pending'})
+
+
+class ResultsCacheInvalidationTests(TestCase):
+    """updated_at des Laufs steckt im Results-Cache-Key und muss bei Änderungen steigen"""
+
+    def setUp(self):
+        self.organizer = CustomUser.objects.create_user(
+            username='organizer', email='organizer@test.com', password='testpass123')
+        self.event = create_event(self.organizer)
+        self.teams = [create_team(self.organizer, i) for i in range(3)]
+        self.run = OptimizationRun.objects.create(event=self.event, status='completed')
+        self.assignment = TeamAssignment.objects.create(
+            optimization_run=self.run, team=self.teams[0], course='appetizer')
+        # Zeitstempel zurücksetzen, damit jede Erhöhung messbar ist
+        self.stale = timezone.now() - timedelta(hours=1)
+        OptimizationRun.objects.filter(pk=self.run.pk).update(updated_at=self.stale)
+
+    def _run_updated_at(self):
+        return OptimizationRun.objects.values_list('updated_at', flat=True).get(pk=self.run.pk)
+
+    def test_assignment_save_bumps_run(self):
+        self.assignment.course = 'dessert'
+        self.assignment.save()
+
+        self.assertGreater(self._run_updated_at(), self.stale)
+
+    def test_assignment_delete_bumps_run(self):
+        self.assignment.delete()
+
+        self.assertGreater(self._run_updated_at(), self.stale)
+
+    def test_bulk_path_flag_skips_per_row_bump(self):
+        self.assignment._skip_cache_invalidation = True
+        self.assignment.save()
+
+        self.assertEqual(self._run_updated_at(), self.stale)
+
+    def test_guest_add_bumps_run(self):
+        self.assignment.guests.add(self.teams[1])
+
+        self.assertGreater(self._run_updated_at(), self.stale)
+
+    def test_guest_clear_from_team_side_bumps_run(self):
+        self.assignment.guests.add(self.teams[1])
+        OptimizationRun.objects.filter(pk=self.run.pk).update(updated_at=self.stale)
+
+        self.teams[1].guest_assignments.clear()
+
+        self.assertGreater(self._run_updated_at(), self.stale)
+
+    def test_run_delete_does_not_fail_on_cascade(self):
+        self.assignment.guests.add(self.teams[1])
+
+        self.run.delete()
 
-# Create your tests here.
+        self.assertFalse(TeamAssignment.objects.filter(pk=self.assignment.pk).exists())
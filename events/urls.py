@@ -28,6 +28,8 @@ urlpatterns = [
          views.remove_organizer, name='remove_organizer'),
     path('<int:event_id>/team/<int:registration_id>/status/',
          views.update_team_status, name='update_team_status'),
+    path('<int:event_id>/teams/status/',
+         views.bulk_update_team_status, name='bulk_update_team_status'),
     path('<int:event_id>/register/', views.register_team, name='register_team'),
     path('<int:event_id>/unregister/',
          views.unregister_team, name='unregister_team'),
@@ -43,6 +45,8 @@ urlpatterns = [
          views.get_route_geometry, name='get_route_geometry'),
     path('<int:event_id>/optimization-progress/',
          views.get_optimization_progress, name='get_optimization_progress'),
+    path('<int:event_id>/optimization-progress/stream/',
+         views.stream_optimization_progress, name='stream_optimization_progress'),
     path('<int:event_id>/additional-optimization/',
          views.run_additional_optimization, name='run_additional_optimization'),
 
@@ -1,23 +1,30 @@
+import hashlib
 import json
 import logging
+import time
+from smtplib import SMTPException
 
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.messages import get_messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.core.cache import cache
-from django.db import models
-from django.db.models import Count, Q
-from django.http import JsonResponse
+from django.core.mail import BadHeaderError, EmailMessage, get_connection
+from django.db import models, transaction
+from django.db.models import Avg, Count, Max, Prefetch, Q
+from django.http import (HttpResponse, HttpResponseBadRequest, JsonResponse,
+                         StreamingHttpResponse)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.cache import cache_page
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
 from rest_framework import permissions, status, viewsets
 from rest_framework.authentication import SessionAuthentication, TokenAuthentication
 from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
 
-from accounts.models import Team, TeamMembership
+from accounts.models import CustomUser, Team, TeamMembership
 from optimization.models import OptimizationRun
 
 from .cache_utils import (
@@ -27,12 +34,36 @@ from .cache_utils import (
     RouteCacheManager,
     cache_function,
     generate_cache_key,
+    optimization_progress_channel,
+    publish_optimization_progress,
 )
 from .models import Course, Event, EventOrganizer, TeamRegistration
 
+try:
+    import orjson
+except ImportError:  # Optional - Fallback auf Django's JsonResponse
+    orjson = None
+
 # Logger setup
 logger = logging.getLogger(__name__)
 
+# Gültige Anmeldestatus - einmalig beim Import berechnet
+_VALID_STATUSES = frozenset(key for key, _label in TeamRegistration.STATUS_CHOICES)
+
+
+def orjson_response(payload, status=200):
+    """
+    JSON-Response über orjson - deutlich schneller bei großen Koordinaten-Arrays
+    Ohne orjson wird JsonResponse verwendet
+    """
+    if orjson is None:
+        return JsonResponse(payload, status=status)
+    return HttpResponse(
+        orjson.dumps(payload, default=str, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        content_type='application/json',
+    )
+
 
 # REST API ViewSets
 class EventViewSet(viewsets.ModelViewSet):
@@ -185,6 +216,28 @@ def get_cached_available_cities():
         'city', flat=True).distinct().order_by('city'))
 
 
+def _event_list_etag(request):
+    """
+    ETag für die öffentliche Event-Liste - None wenn Flash-Messages anstehen
+    Letzte Änderung + Anzahl der Events und ihrer Anmeldungen + User
+    (Seite ist user-abhängig und zeigt die Team-Anzahl je Event)
+    """
+    if len(get_messages(request)):
+        return None
+    # Ein Aggregat über den JOIN - Count('id') daher distinct
+    state = Event.objects.filter(is_public=True).aggregate(
+        last_modified=Max('updated_at'),
+        count=Count('id', distinct=True),
+        registrations_modified=Max('team_registrations__updated_at'),
+        registrations=Count('team_registrations'),
+    )
+    raw = (f"{state['last_modified']}:{state['count']}:"
+           f"{state['registrations_modified']}:{state['registrations']}:"
+           f"{request.user.pk}:{request.get_full_path()}")
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+@condition(etag_func=_event_list_etag)
 def event_list(request):
     """Optimierte Liste aller öffentlichen Events mit Redis Caching"""
     # Parameter aus Request
@@ -225,6 +278,7 @@ def get_user_specific_data(event, user):
         return {
             'user_teams': None,
             'user_registrations': None,
+            'registered_team_ids': set(),
             'is_organizer': False,
             'user_role': None,
         }
@@ -236,21 +290,26 @@ def get_user_specific_data(event, user):
     if cached_data is not None:
         return cached_data
     
+    # Nur die Felder laden, die das Template tatsächlich braucht
     user_teams = Team.objects.filter(
         teammembership__user=user,
         teammembership__is_active=True,
         is_active=True
-    ).select_related()
+    ).only('id', 'name', 'is_active')
     
-    user_registrations = TeamRegistration.objects.filter(
+    user_registrations = list(TeamRegistration.objects.filter(
         event=event,
         team__teammembership__user=user,
         team__teammembership__is_active=True
-    ).select_related('team')
+    ).select_related('team').only(
+        'id', 'status', 'preferred_course', 'team__id', 'team__name'
+    ))
     
     user_data = {
         'user_teams': list(user_teams),
-        'user_registrations': list(user_registrations),
+        'user_registrations': user_registrations,
+        # Set für O(1) Membership-Tests im Template
+        'registered_team_ids': {reg.team_id for reg in user_registrations},
         'is_organizer': event.can_user_manage_event(user),
         'user_role': event.get_organizer_role(user),
     }
@@ -362,6 +421,49 @@ def create_event(request):
     return render(request, 'events/create_event.html')
 
 
+def get_critical_allergies_for_event(event):
+    """
+    Kritische Allergien aller Mitglieder bestätigter Teams in einer Query
+    Liefert das gleiche Format wie Team.get_team_emergency_info() plus team_name
+    """
+    from accounts.models import DietaryRestriction
+
+    severity_display = dict(DietaryRestriction.SEVERITY_CHOICES)
+    rows = DietaryRestriction.objects.filter(
+        severity__in=['severe', 'life_threatening'],
+        customuser__team_memberships__is_active=True,
+        customuser__team_memberships__team__event_registrations__event=event,
+        customuser__team_memberships__team__event_registrations__status='confirmed',
+    ).values(
+        'name', 'emergency_info', 'severity',
+        'customuser__id', 'customuser__first_name', 'customuser__last_name',
+        'customuser__email', 'customuser__emergency_contact',
+        'customuser__emergency_phone', 'customuser__team_memberships__team__name',
+    ).order_by('customuser__team_memberships__team__name', 'customuser__last_name', 'name')
+
+    # Gruppiere Allergien pro Mitglied und Team
+    critical_by_member = {}
+    for row in rows:
+        key = (row['customuser__id'], row['customuser__team_memberships__team__name'])
+        if key not in critical_by_member:
+            critical_by_member[key] = {
+                'member': f"{row['customuser__first_name']} {row['customuser__last_name']}".strip(),
+                'member_email': row['customuser__email'],
+                'has_critical': True,
+                'allergies': [],
+                'emergency_contact': row['customuser__emergency_contact'],
+                'emergency_phone': row['customuser__emergency_phone'],
+                'team_name': row['customuser__team_memberships__team__name'],
+            }
+        critical_by_member[key]['allergies'].append({
+            'name': row['name'],
+            'emergency_info': row['emergency_info'],
+            'severity': severity_display.get(row['severity'], row['severity']),
+        })
+
+    return list(critical_by_member.values())
+
+
 @login_required
 def manage_event(request, event_id):
     """Event-Management Interface"""
@@ -377,25 +479,19 @@ def manage_event(request, event_id):
     registrations = TeamRegistration.objects.filter(
         event=event).select_related('team').prefetch_related(
         'team__teammembership_set__user'
-    )
+    ).annotate(team_member_count=Count('team__members'))
     organizers = EventOrganizer.objects.filter(
         event=event, is_active=True).select_related('user')
 
     # Statistiken
     confirmed_teams = registrations.filter(status='confirmed').count()
     pending_teams = registrations.filter(status='pending').count()
-    total_participants = sum(
-        reg.team.member_count for reg in registrations.filter(status='confirmed'))
+    total_participants = TeamRegistration.objects.filter(
+        event=event, status='confirmed'
+    ).aggregate(total=Count('team__members'))['total'] or 0
 
     # Allergie-Übersicht
-    critical_allergies = []
-    for reg in registrations.filter(status='confirmed'):
-        team_critical = reg.team.get_team_emergency_info()
-        if team_critical:
-            # Füge Teamname zu jeder Allergie-Info hinzu
-            for allergy_info in team_critical:
-                allergy_info['team_name'] = reg.team.name
-            critical_allergies.extend(team_critical)
+    critical_allergies = get_critical_allergies_for_event(event)
 
     # Berechtige Benutzer-Aktionen für Template
     user_can_manage_teams = event.can_user_manage_teams(request.user)
@@ -557,10 +653,10 @@ def update_team_status(request, event_id, registration_id):
         return redirect('events:manage_event', event_id=event_id)
 
     new_status = request.POST.get('status')
-    if new_status in [choice[0] for choice in TeamRegistration.STATUS_CHOICES]:
+    if new_status in _VALID_STATUSES:
         old_status = registration.get_status_display()
         registration.status = new_status
-        registration.save()
+        registration.save(update_fields=['status', 'updated_at'])
 
         messages.success(
             request,
@@ -572,6 +668,50 @@ def update_team_status(request, event_id, registration_id):
     return redirect('events:manage_event', event_id=event_id)
 
 
+@login_required
+@require_http_methods(["POST"])
+def bulk_update_team_status(request, event_id):
+    """Anmeldestatus mehrerer Teams auf einmal aktualisieren (ein UPDATE)"""
+    event = get_object_or_404(Event, id=event_id)
+
+    if not event.can_user_manage_teams(request.user):
+        messages.error(
+            request, 'Sie haben keine Berechtigung, Teams zu verwalten.')
+        return redirect('events:manage_event', event_id=event_id)
+
+    new_status = request.POST.get('status')
+    if new_status not in _VALID_STATUSES:
+        messages.error(request, 'Ungültiger Status.')
+        return redirect('events:manage_event', event_id=event_id)
+
+    registration_ids = [
+        reg_id for reg_id in request.POST.getlist('registration_ids') if reg_id.isdigit()]
+    if not registration_ids:
+        messages.error(request, 'Bitte wähle mindestens ein Team aus.')
+        return redirect('events:manage_event', event_id=event_id)
+
+    registrations = TeamRegistration.objects.filter(
+        event=event, id__in=registration_ids)
+    updated_count = registrations.update(
+        status=new_status, updated_at=timezone.now())
+
+    # update() umgeht post_save - Caches daher manuell invalidieren
+    EventCacheManager.invalidate_event_cache(event.id)
+    get_cached_event_detail_base.clear_cache(event.id)
+    member_ids = TeamMembership.objects.filter(
+        team__event_registrations__in=registrations, is_active=True
+    ).values_list('user_id', flat=True)
+    cache.delete_many([
+        generate_cache_key('user_event_data', event.id, user_id) for user_id in member_ids
+    ])
+
+    status_display = dict(TeamRegistration.STATUS_CHOICES)[new_status]
+    messages.success(
+        request, f'Status von {updated_count} Teams zu "{status_display}" geändert.')
+
+    return redirect('events:manage_event', event_id=event_id)
+
+
 @login_required
 @require_http_methods(["POST"])
 def register_team(request, event_id):
@@ -695,126 +835,151 @@ def start_optimization(request, event_id):
     try:
         # Setze Status auf "Optimierung läuft"
         event.status = 'optimization_running'
-        event.save()
+        event.save(update_fields=['status', 'updated_at'])
 
-        # Lösche alle alten OptimizationRuns und TeamAssignments für dieses Event
         import logging
 
         from django.utils import timezone
 
-        from optimization.models import OptimizationRun, TeamAssignment
+        from optimization.models import (OptimizationRun, OptimizationRunLog,
+                                         TeamAssignment)
 
         from .optimization import RunningDinnerOptimizer
 
         logger = logging.getLogger(__name__)
 
-        # Lösche alte Optimierungen
-        old_runs = OptimizationRun.objects.filter(event=event)
-        old_assignments_count = TeamAssignment.objects.filter(
-            optimization_run__event=event).count()
-        old_runs.delete()  # Löscht auch TeamAssignments durch CASCADE
-
-        logger.info(
-            f"🗑️ {old_assignments_count} alte Team-Zuweisungen gelöscht")
+        started_at = timezone.now()
 
         # Erstelle und konfiguriere Optimizer
         optimizer = RunningDinnerOptimizer(event)
 
-        # Erstelle neuen OptimizationRun
-        optimization_run = OptimizationRun.objects.create(
-            event=event,
-            status='running',
-            algorithm='mip_pulp',  # Mixed-Integer Programming mit PuLP
-            started_at=timezone.now(),
-            log_data={
-                'initiated_by': request.user.username,
-                'initiated_at': timezone.now().isoformat(),
-                'max_distance_km': float(event.max_distance_km),
-                'groups_per_course': event.groups_per_course,
-                'team_size': event.team_size,
-                'old_assignments_deleted': old_assignments_count,
-                'algorithm': 'Mixed-Integer Programming (MIP)',
-                'solver': 'PuLP CBC'
-            }
-        )
-
-        # STARTE MIP-OPTIMIERUNG
+        # STARTE MIP-OPTIMIERUNG (außerhalb der Transaktion - externe Routing-Aufrufe)
         logger.info("🚀 Starte professionelle MIP-Optimierung...")
         solution = optimizer.optimize()
 
         team_count = len(solution['assignments'])
-        total_distance = sum([assignment['total_distance']
-                             for assignment in solution['assignments']])
+        total_distance = sum(assignment['total_distance']
+                             for assignment in solution['assignments'])
 
-        # Konvertiere MIP-Lösung zu Django-Modellen
+        # Index: (Host-Team-ID, Kurs) -> Gast-Teams, statt pro Host alle Zuweisungen zu durchsuchen
+        guests_by_host_course = {}
         for assignment_data in solution['assignments']:
-            team = assignment_data['team']
-            hosts = assignment_data['hosts']
-            course_hosted = assignment_data['course_hosted']
-            distances = assignment_data['distances']
-
-            # Erstelle TeamAssignment
-            assignment = TeamAssignment.objects.create(
-                optimization_run=optimization_run,
-                team=team,
-                course=course_hosted or 'guest',  # Kurs den das Team hostet
-                hosts_appetizer=hosts.get('appetizer'),
-                hosts_main_course=hosts.get('main_course'),
-                hosts_dessert=hosts.get('dessert'),
-                distance_to_appetizer=distances.get('appetizer', 0),
-                distance_to_main_course=distances.get('main_course', 0),
-                distance_to_dessert=distances.get('dessert', 0),
-                total_distance=assignment_data['total_distance'],
-                # Bessere Scores für kürzere Wege
-                preference_score=round(
-                    95.0 - (assignment_data['total_distance'] * 2), 1)
-            )
-
-            # Füge Gäste hinzu (wenn das Team hostet)
-            if course_hosted:
-                # Finde alle Teams die zu diesem Host kommen (korrekte Logik)
-                guest_teams = []
-                for other_assignment_data in solution['assignments']:
-                    other_team = other_assignment_data['team']
-                    other_hosts = other_assignment_data['hosts']
-
-                    # Wenn das andere Team zu mir als Host für meinen Kurs kommt
-                    if other_hosts.get(course_hosted) == team and other_team != team:
-                        guest_teams.append(other_team)
-
-                if guest_teams:
-                    assignment.guests.set(guest_teams)
-                    logger.info(
-                        f"🏠 Team '{team.name}' hostet {course_hosted} für {len(guest_teams)} Gäste")
+            for course, host in assignment_data['hosts'].items():
+                if host is not None and host != assignment_data['team']:
+                    guests_by_host_course.setdefault(
+                        (host.id, course), []).append(assignment_data['team'])
 
         # Vorberechnung aller Route-Geometrien für schnelle Karten-Darstellung
         logger.info("🗺️ Berechne Route-Geometrien für Kartendarstellung...")
         precalculate_route_geometries(event, solution['assignments'])
 
-        # Optimierung abschließen
-        optimization_run.status = 'completed'
-        optimization_run.completed_at = timezone.now()
-        optimization_run.total_distance = round(total_distance, 1)
-        optimization_run.objective_value = round(
-            solution['objective_value'], 1)
-        optimization_run.iterations_completed = 1  # MIP ist exakt, keine Iterationen
-        optimization_run.execution_time = round(
-            (timezone.now() - optimization_run.started_at).total_seconds(), 1)
-        optimization_run.log_data.update({
-            'optimization_completed': True,
-            'routes_created': team_count,
-            'avg_distance_per_team': round(total_distance / team_count, 2),
-            'mip_objective_value': solution['objective_value'],
-            'penalties': solution['penalties'],
-            'travel_times': solution['travel_times'],
-            'hosting_distribution': solution['hosting'],
-            'route_geometries_precalculated': True
-        })
-        optimization_run.save()
+        # Alle Schreibzugriffe in einer Transaktion: alte Ergebnisse bleiben
+        # sichtbar bis die neuen vollständig gespeichert sind
+        with transaction.atomic():
+            # Lösche alte Optimierungen (TeamAssignments durch CASCADE)
+            _, deleted_per_model = OptimizationRun.objects.filter(
+                event=event).delete()
+            old_assignments_count = deleted_per_model.get(
+                TeamAssignment._meta.label, 0)
 
-        # Setze Event-Status auf "Optimiert"
-        event.status = 'optimized'
-        event.save()
+            logger.info(
+                f"🗑️ {old_assignments_count} alte Team-Zuweisungen gelöscht")
+
+            # Erstelle neuen OptimizationRun
+            optimization_run = OptimizationRun.objects.create(
+                event=event,
+                status='running',
+                algorithm='mip_pulp',  # Mixed-Integer Programming mit PuLP
+                started_at=started_at,
+            )
+            log_data = {
+                'initiated_by': request.user.username,
+                'initiated_at': started_at.isoformat(),
+                'max_distance_km': float(event.max_distance_km),
+                'groups_per_course': event.groups_per_course,
+                'team_size': event.team_size,
+                'old_assignments_deleted': old_assignments_count,
+                'algorithm': 'Mixed-Integer Programming (MIP)',
+                'solver': 'PuLP CBC'
+            }
+
+            # Konvertiere MIP-Lösung zu Django-Modellen - ein INSERT pro Batch statt pro Team
+            assignments = []
+            for assignment_data in solution['assignments']:
+                distances = assignment_data['distances']
+                hosts = assignment_data['hosts']
+                assignments.append(TeamAssignment(
+                    optimization_run=optimization_run,
+                    team=assignment_data['team'],
+                    # Kurs den das Team hostet
+                    course=assignment_data['course_hosted'] or 'guest',
+                    hosts_appetizer=hosts.get('appetizer'),
+                    hosts_main_course=hosts.get('main_course'),
+                    hosts_dessert=hosts.get('dessert'),
+                    distance_to_appetizer=distances.get('appetizer', 0),
+                    distance_to_main_course=distances.get('main_course', 0),
+                    distance_to_dessert=distances.get('dessert', 0),
+                    # total_distance berechnet die Datenbank (GeneratedField)
+                    distance_to_afterparty=assignment_data.get(
+                        'afterparty_route', {}).get('distance', 0),
+                    # Bessere Scores für kürzere Wege
+                    preference_score=round(
+                        95.0 - (assignment_data['total_distance'] * 2), 1)
+                ))
+            TeamAssignment.objects.bulk_create(assignments, batch_size=500)
+
+            # Füge Gäste hinzu (wenn das Team hostet) - alle M2M-Zeilen in einem bulk_create
+            GuestLink = TeamAssignment.guests.through
+            guest_links = []
+            for assignment, assignment_data in zip(assignments, solution['assignments']):
+                course_hosted = assignment_data['course_hosted']
+                if not course_hosted:
+                    continue
+
+                # Alle Teams die zu mir als Host für meinen Kurs kommen
+                team = assignment_data['team']
+                guest_teams = guests_by_host_course.get(
+                    (team.id, course_hosted), [])
+                if guest_teams:
+                    guest_links.extend(
+                        GuestLink(teamassignment_id=assignment.pk,
+                                  team_id=guest.id)
+                        for guest in guest_teams
+                    )
+                    logger.info(
+                        f"🏠 Team '{team.name}' hostet {course_hosted} für {len(guest_teams)} Gäste")
+            GuestLink.objects.bulk_create(guest_links, batch_size=500)
+
+            # Optimierung abschließen
+            optimization_run.status = 'completed'
+            optimization_run.completed_at = timezone.now()
+            optimization_run.total_distance = round(total_distance, 1)
+            optimization_run.objective_value = round(
+                solution['objective_value'], 1)
+            optimization_run.iterations_completed = 1  # MIP ist exakt, keine Iterationen
+            optimization_run.execution_time = round(
+                (timezone.now() - optimization_run.started_at).total_seconds(), 1)
+            log_data.update({
+                'optimization_completed': True,
+                'routes_created': team_count,
+                'avg_distance_per_team': round(total_distance / team_count, 2),
+                'mip_objective_value': solution['objective_value'],
+                'penalties': solution['penalties'],
+                'travel_times': solution['travel_times'],
+                'hosting_distribution': solution['hosting'],
+                'route_geometries_precalculated': True
+            })
+            optimization_run.save(update_fields=[
+                'status', 'completed_at', 'total_distance', 'objective_value',
+                'iterations_completed', 'execution_time', 'updated_at'
+            ])
+            # Logs in eigener Tabelle - hält die OptimizationRun-Zeile schmal
+            OptimizationRunLog.objects.update_or_create(
+                run=optimization_run, defaults={'data': log_data})
+
+            # Setze Event-Status auf "Optimiert"
+            event.status = 'optimized'
+            event.save(update_fields=['status', 'updated_at'])
 
         # Markiere Erfolg im Cache für Live-Updates
         from django.core.cache import cache
@@ -837,6 +1002,7 @@ def start_optimization(request, event_id):
             'message': f'✅ ABGESCHLOSSEN: {team_count} Teams optimiert, {total_distance:.1f}km Gesamtdistanz'
         })
         cache.set(log_key, current_logs, timeout=300)
+        publish_optimization_progress(event.id, cache.get(progress_key), current_logs)
 
         messages.success(
             request,
@@ -846,7 +1012,7 @@ def start_optimization(request, event_id):
 
     except Exception as e:
         event.status = 'registration_closed'
-        event.save()
+        event.save(update_fields=['status', 'updated_at'])
 
         # Markiere Fehler im Cache für Live-Updates
         from django.core.cache import cache
@@ -870,6 +1036,7 @@ def start_optimization(request, event_id):
             'message': f'FEHLER: {str(e)}'
         })
         cache.set(log_key, current_logs, timeout=300)
+        publish_optimization_progress(event.id, cache.get(progress_key), current_logs)
 
         logger.error(f"Optimierung für Event {event.id} fehlgeschlagen: {e}")
         messages.error(
@@ -878,20 +1045,38 @@ def start_optimization(request, event_id):
     return redirect('events:manage_event', event_id=event_id)
 
 
-@login_required
-@cache_function('optimization_results', 600)  # 10 Minuten Cache - sehr rechenintensiv
 def get_cached_optimization_results_data(event_id, optimization_run_id):
-    """Cached Optimization Results Data - sehr rechenintensive Verarbeitung"""
-    from optimization.models import OptimizationRun, TeamAssignment
-    
-    optimization_run = OptimizationRun.objects.get(id=optimization_run_id)
-    
+    """
+    Cached Optimization Results Data - sehr rechenintensive Verarbeitung
+    updated_at im Key: jede Änderung am Lauf (oder seinen Zuweisungen) ergibt einen neuen Key
+    """
+    from optimization.models import OptimizationRun
+
+    optimization_run = OptimizationRun.objects.get(id=optimization_run_id, event_id=event_id)
+    cache_key = generate_cache_key(
+        'optimization_results', optimization_run.id, optimization_run.updated_at.timestamp()
+    )
+    return cache.get_or_set(
+        cache_key,
+        lambda: _build_results_context(optimization_run),
+        3600,  # 1 Stunde - abgeschlossene Läufe ändern sich kaum
+    )
+
+
+def _build_results_context(optimization_run):
+    """Baut Zuweisungen, Host-Übersicht und Statistiken für die Ergebnisseite"""
+    from optimization.models import TeamAssignment
+
     # Hole alle Team-Zuweisungen mit optimierten Queries
     assignments = TeamAssignment.objects.filter(
         optimization_run=optimization_run
     ).select_related(
         'team', 'hosts_appetizer', 'hosts_main_course', 'hosts_dessert'
-    ).prefetch_related('guests')
+    ).prefetch_related(
+        'guests',
+        # team.member_count (members.count()) im Template liest aus dem Prefetch-Cache
+        Prefetch('team__members', queryset=CustomUser.objects.only('id')),
+    ).defer('constraint_violations').order_by('team__name')
     
     assignments_list = list(assignments)  # Evaluate QuerySet einmalig
 
@@ -924,12 +1109,18 @@ def get_cached_optimization_results_data(event_id, optimization_run_id):
                 'guests': guests_list
             })
 
-    # Berechne Statistiken (optimiert)
-    total_distance = sum(a.total_distance or 0 for a in assignments_list)
-    assignment_count = len(assignments_list)
+    # Berechne Statistiken (optimiert) - eine Aggregat-Query in der DB.
+    # Gesamtdistanz ist auf dem Lauf denormalisiert (beim Speichern der Zuweisungen gesetzt)
+    stats = TeamAssignment.objects.filter(
+        optimization_run=optimization_run
+    ).aggregate(
+        avg_preference_score=Avg('preference_score'),
+        assignment_count=Count('id'),
+    )
+    total_distance = optimization_run.total_distance or 0
+    assignment_count = stats['assignment_count']
     avg_distance = total_distance / assignment_count if assignment_count else 0
-    avg_preference_score = sum(
-        a.preference_score or 0 for a in assignments_list) / assignment_count if assignment_count else 0
+    avg_preference_score = stats['avg_preference_score'] or 0
 
     return {
         'optimization_run': optimization_run,
@@ -988,12 +1179,29 @@ def optimization_results(request, event_id):
 
     context = {
         'event': event,
+        # Gastküchen samt Host-Team in einer Query für die Karte
+        'guest_kitchens': event.guest_kitchens.select_related('host_team'),
         **cached_results,
     }
 
     return render(request, 'events/optimization_results.html', context)
 
 
+def _assignment_email_body(event, team_name, course):
+    """Text der Zuteilungs-E-Mail für ein Team"""
+    course_names = dict(Course.COURSE_CHOICES)
+    if course in course_names:
+        course_line = f'Ihr kocht: {course_names[course]}.'
+    else:
+        course_line = 'Ihr seid bei allen Gängen zu Gast.'
+
+    return (
+        f'Hallo {team_name},\n\n'
+        f'die Zuteilung für "{event.name}" steht fest. {course_line}\n\n'
+        'Alle Details findet ihr in der Running-Dinner-App.'
+    )
+
+
 @login_required
 @require_http_methods(["POST"])
 def send_team_emails(request, event_id):
@@ -1006,7 +1214,6 @@ def send_team_emails(request, event_id):
             request, 'Sie haben keine Berechtigung, E-Mails zu senden.')
         return redirect('events:optimization_results', event_id=event_id)
 
-    # TODO: Hier würde der echte E-Mail-Versand implementiert
     from optimization.models import OptimizationRun, TeamAssignment
     latest_optimization = event.optimization_runs.filter(
         status='completed'
@@ -1016,22 +1223,51 @@ def send_team_emails(request, event_id):
         messages.error(request, 'Keine Optimierung gefunden.')
         return redirect('events:manage_event', event_id=event_id)
 
-    assignments = TeamAssignment.objects.filter(
-        optimization_run=latest_optimization
-    ).select_related('team')
+    # Nur Empfänger-Daten als Tupel laden - keine Model-Instanzen nötig.
+    # Bereits benachrichtigte Teams überspringen, damit ein erneuter Versand nicht doppelt mailt
+    email_targets = [
+        target for target in TeamAssignment.objects.filter(
+            optimization_run=latest_optimization, email_sent_at__isnull=True
+        ).values_list('pk', 'team__name', 'team__contact_person__email', 'course')
+        if target[2]
+    ]
+    if not email_targets:
+        messages.info(request, 'Alle Teams wurden bereits benachrichtigt.')
+        return redirect('events:optimization_results', event_id=event_id)
 
-    # Placeholder: Simuliere E-Mail-Versand
-    email_count = 0
-    for assignment in assignments:
-        # TODO: Hier würde die echte E-Mail gesendet
-        # send_team_assignment_email(assignment)
-        email_count += 1
+    subject = f'Running Dinner "{event.name}": Eure Zuteilung'
+    sent_ids = []
+    failed_count = 0
 
-    messages.success(
-        request,
-        f'E-Mails erfolgreich an {email_count} Teams gesendet! '
-        '(Hinweis: Dies ist aktuell nur eine Simulation)'
-    )
+    # Eine SMTP-Verbindung für alle Nachrichten statt einem Handshake pro Team
+    try:
+        with get_connection(fail_silently=False) as connection:
+            for assignment_id, team_name, email, course in email_targets:
+                message = EmailMessage(
+                    subject, _assignment_email_body(event, team_name, course),
+                    settings.DEFAULT_FROM_EMAIL, [email], connection=connection)
+                try:
+                    message.send()
+                except (SMTPException, BadHeaderError) as e:
+                    failed_count += 1
+                    logger.warning(f"E-Mail an Team {team_name} fehlgeschlagen: {e}")
+                    continue
+                sent_ids.append(assignment_id)
+    except (SMTPException, OSError) as e:
+        # Verbindung gescheitert oder abgebrochen - bis dahin Versendetes wird trotzdem vermerkt
+        logger.error(f"E-Mail-Versand für Event {event.id} fehlgeschlagen: {e}")
+        messages.error(request, f'Fehler beim E-Mail-Versand: {str(e)}')
+    finally:
+        if sent_ids:
+            TeamAssignment.objects.filter(pk__in=sent_ids).update(email_sent_at=timezone.now())
+
+    if sent_ids:
+        messages.success(
+            request, f'E-Mails erfolgreich an {len(sent_ids)} Teams gesendet!')
+    if failed_count:
+        messages.warning(
+            request, f'{failed_count} E-Mails konnten nicht gesendet werden. '
+                     'Ein erneuter Versand schickt nur die fehlenden.')
 
     return redirect('events:optimization_results', event_id=event_id)
 
@@ -1052,28 +1288,44 @@ def adjust_assignment(request, event_id, assignment_id):
     from optimization.models import TeamAssignment
 
     assignment = get_object_or_404(
-        TeamAssignment, id=assignment_id, optimization_run__event=event)
+        TeamAssignment.objects.select_related('team', 'optimization_run'),
+        id=assignment_id, optimization_run__event=event)
+
+    # Nur gültige Kurse zulassen - alles andere würde ungeprüft gespeichert
+    course = request.POST.get('course')
+    if course not in dict(TeamAssignment._meta.get_field('course').choices):
+        return HttpResponseBadRequest(f'Ungültiger Kurs: {course}')
 
     try:
         # Update assignment data
-        assignment.course = request.POST.get('course')
+        assignment.course = course
 
         # Update host assignments
         hosts_appetizer_id = request.POST.get('hosts_appetizer')
         hosts_main_course_id = request.POST.get('hosts_main_course')
         hosts_dessert_id = request.POST.get('hosts_dessert')
 
-        assignment.hosts_appetizer = Team.objects.get(
-            id=hosts_appetizer_id) if hosts_appetizer_id else None
-        assignment.hosts_main_course = Team.objects.get(
-            id=hosts_main_course_id) if hosts_main_course_id else None
-        assignment.hosts_dessert = Team.objects.get(
-            id=hosts_dessert_id) if hosts_dessert_id else None
+        # Alle Host-Teams mit einer Query prüfen statt drei einzelnen get()
+        host_ids = {int(host_id) for host_id in (
+            hosts_appetizer_id, hosts_main_course_id, hosts_dessert_id) if host_id}
+        existing_teams = Team.objects.in_bulk(host_ids)
+        missing_ids = host_ids - existing_teams.keys()
+        if missing_ids:
+            raise Team.DoesNotExist(
+                f"Team(s) nicht gefunden: {', '.join(map(str, sorted(missing_ids)))}")
+
+        assignment.hosts_appetizer_id = int(
+            hosts_appetizer_id) if hosts_appetizer_id else None
+        assignment.hosts_main_course_id = int(
+            hosts_main_course_id) if hosts_main_course_id else None
+        assignment.hosts_dessert_id = int(
+            hosts_dessert_id) if hosts_dessert_id else None
 
         # TODO: Recalculate distances based on new assignments
         # For now, keep existing distances
 
-        assignment.save()
+        assignment.save(update_fields=[
+            'course', 'hosts_appetizer', 'hosts_main_course', 'hosts_dessert'])
 
         messages.success(
             request,
@@ -1096,7 +1348,7 @@ def get_route_geometry(request, event_id):
 
     # Prüfe Berechtigung
     if not (request.user.is_staff or request.user.is_superuser):
-        return JsonResponse({'error': 'Keine Berechtigung'}, status=403)
+        return orjson_response({'error': 'Keine Berechtigung'}, status=403)
 
     # Parameter aus Request
     start_lat = request.GET.get('start_lat')
@@ -1105,7 +1357,7 @@ def get_route_geometry(request, event_id):
     end_lng = request.GET.get('end_lng')
 
     if not all([start_lat, start_lng, end_lat, end_lng]):
-        return JsonResponse({'error': 'Fehlende Koordinaten'}, status=400)
+        return orjson_response({'error': 'Fehlende Koordinaten'}, status=400)
 
     try:
         from .models import RouteGeometry
@@ -1119,7 +1371,7 @@ def get_route_geometry(request, event_id):
             end_lng=float(end_lng)
         )
 
-        return JsonResponse({
+        return orjson_response({
             'success': True,
             'route_points': route.geometry_points,
             'point_count': route.point_count,
@@ -1129,9 +1381,9 @@ def get_route_geometry(request, event_id):
         })
 
     except ValueError:
-        return JsonResponse({'error': 'Ungültige Koordinaten'}, status=400)
+        return orjson_response({'error': 'Ungültige Koordinaten'}, status=400)
     except Exception as e:
-        return JsonResponse({'error': f'Route-Fehler: {str(e)}'}, status=500)
+        return orjson_response({'error': f'Route-Fehler: {str(e)}'}, status=500)
 
 
 def precalculate_route_geometries(event, assignments):
@@ -1225,32 +1477,8 @@ def precalculate_route_geometries(event, assignments):
         f"✅ {route_count} Route-Geometrien vorberechnet - Karte lädt jetzt sofort!")
 
 
-@login_required
-def get_optimization_progress(request, event_id):
-    """
-    API-Endpoint für Optimierung-Progress Updates
-    """
-    event = get_object_or_404(Event, id=event_id)
-
-    # Prüfe Berechtigung
-    if not (request.user.is_staff or request.user.is_superuser):
-        return JsonResponse({'error': 'Keine Berechtigung'}, status=403)
-
-    from django.core.cache import cache
-
-    progress_key = f"optimization_progress_{event_id}"
-    log_key = f"optimization_log_{event_id}"
-
-    progress = cache.get(progress_key, {
-        'step': 0,
-        'total_steps': 5,
-        'current_task': 'Keine aktive Optimierung',
-        'percentage': 0,
-        'status': 'idle'
-    })
-
-    logs = cache.get(log_key, [])
-
+def _format_optimization_progress(progress, logs):
+    """Bringt Progress + Logs in das Format, das das Frontend erwartet"""
     # Format für Frontend-Kompatibilität
     log_strings = []
     for log_entry in logs[-20:]:  # Nur die letzten 20 Log-Einträge
@@ -1265,7 +1493,7 @@ def get_optimization_progress(request, event_id):
     if isinstance(percentage, str):
         percentage = float(percentage.replace(',', '.'))
 
-    return JsonResponse({
+    return {
         'success': True,
         'step': progress.get('step', 0),
         'total_steps': progress.get('total_steps', 5),
@@ -1275,7 +1503,120 @@ def get_optimization_progress(request, event_id):
         'timestamp': progress.get('timestamp', ''),
         'logs': log_strings,
         'error': progress.get('error', None)
+    }
+
+
+def _read_optimization_progress(event_id):
+    """Aktueller Progress-Stand aus dem Cache"""
+    progress = cache.get(f"optimization_progress_{event_id}", {
+        'step': 0,
+        'total_steps': 5,
+        'current_task': 'Keine aktive Optimierung',
+        'percentage': 0,
+        'status': 'idle'
     })
+    logs = cache.get(f"optimization_log_{event_id}", [])
+
+    return _format_optimization_progress(progress, logs)
+
+
+@login_required
+def get_optimization_progress(request, event_id):
+    """
+    API-Endpoint für Optimierung-Progress Updates
+    """
+    event = get_object_or_404(Event, id=event_id)
+
+    # Prüfe Berechtigung
+    if not (request.user.is_staff or request.user.is_superuser):
+        return orjson_response({'error': 'Keine Berechtigung'}, status=403)
+
+    return orjson_response(_read_optimization_progress(event.id))
+
+
+# Maximale Stream-Dauer unter gunicorn --timeout 120 - ein laufender Stream endet
+# danach und der Browser verbindet per retry neu
+SSE_MAX_SECONDS = 90
+# Ohne laufende Optimierung nur kurz auf den Start warten, dann Stream beenden
+SSE_IDLE_GRACE_SECONDS = 10
+_SSE_TERMINAL_STATUSES = ('completed', 'error', 'failed')
+
+
+def _optimization_progress_events(event_id, max_seconds=SSE_MAX_SECONDS,
+                                  idle_seconds=SSE_IDLE_GRACE_SECONDS):
+    """
+    SSE-Generator: aktueller Stand sofort, danach nur echte Änderungen via Redis Pub/Sub
+    Läuft keine Optimierung (mehr), endet der Stream mit einem "end"-Event - der
+    Client schließt dann die EventSource statt endlos neu zu verbinden.
+    Ohne Redis endet ein laufender Stream nach dem ersten Event (Reconnect per retry).
+    """
+    def sse(payload):
+        return f"data: {json.dumps(payload)}\n\n"
+
+    def sse_end(payload):
+        return f"event: end\ndata: {json.dumps(payload)}\n\n"
+
+    pubsub = None
+    try:
+        from django_redis import get_redis_connection
+        pubsub = get_redis_connection("default").pubsub(ignore_subscribe_messages=True)
+        # Vor dem Lesen des Caches abonnieren, damit kein Update verloren geht
+        pubsub.subscribe(optimization_progress_channel(event_id))
+    except Exception:
+        pubsub = None
+
+    try:
+        current = _read_optimization_progress(event_id)
+        yield "retry: 2000\n" + sse(current)
+        running = current['status'] == 'running'
+        if current['status'] in _SSE_TERMINAL_STATUSES or (pubsub is None and not running):
+            yield sse_end(current)
+            return
+        if pubsub is None:
+            return
+
+        started = time.monotonic()
+        deadline = started + (max_seconds if running else idle_seconds)
+        while time.monotonic() < deadline:
+            wait = min(15, max(deadline - time.monotonic(), 0))
+            message = pubsub.get_message(timeout=wait)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            data = json.loads(message['data'])
+            current = _format_optimization_progress(data['progress'], data['logs'])
+            yield sse(current)
+            if current['status'] in _SSE_TERMINAL_STATUSES:
+                yield sse_end(current)
+                return
+            if current['status'] == 'running' and not running:
+                running = True
+                deadline = started + max_seconds
+
+        if not running:
+            yield sse_end(current)
+    finally:
+        if pubsub is not None:
+            pubsub.close()
+
+
+@login_required
+def stream_optimization_progress(request, event_id):
+    """
+    Server-Sent Events Endpoint für Optimierung-Progress (ersetzt Polling)
+    """
+    event = get_object_or_404(Event, id=event_id)
+
+    # Prüfe Berechtigung
+    if not (request.user.is_staff or request.user.is_superuser):
+        return orjson_response({'error': 'Keine Berechtigung'}, status=403)
+
+    response = StreamingHttpResponse(
+        _optimization_progress_events(event.id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Kein Buffering durch nginx
+    return response
 
 
 @login_required
@@ -1304,16 +1645,19 @@ def run_additional_optimization(request, event_id):
         additional_iterations = max(
             1, min(additional_iterations, 10))  # 1-10 Iterationen
 
-        # Setze Progress auf 'running'
-        cache.set(cache_key, {
+        # Setze Progress auf 'running' - und sofort an verbundene SSE-Clients pushen
+        start_logs = [f'🔄 Starte {additional_iterations} weitere Optimierungsiterationen...']
+        start_progress = {
             'step': 0,
             'total_steps': 3,
             'current_task': 'Starte weitere Optimierung...',
             'percentage': 0,
             'status': 'running',
             'timestamp': timezone.now().isoformat(),
-            'logs': [f'🔄 Starte {additional_iterations} weitere Optimierungsiterationen...']
-        }, timeout=3600)
+            'logs': start_logs
+        }
+        cache.set(cache_key, start_progress, timeout=3600)
+        publish_optimization_progress(event_id, start_progress, start_logs)
 
         # Führe zusätzliche Optimierung durch
         optimizer = RunningDinnerOptimizer(event)
@@ -1321,7 +1665,7 @@ def run_additional_optimization(request, event_id):
             max_additional_iterations=additional_iterations)
 
         # Cache auf 'completed' setzen
-        cache.set(cache_key, {
+        progress = {
             'step': 3,
             'total_steps': 3,
             'current_task': 'Weitere Optimierung abgeschlossen!',
@@ -1332,7 +1676,9 @@ def run_additional_optimization(request, event_id):
                 f'🔄 Starte {additional_iterations} weitere Optimierungsiterationen...',
                 f'✅ Weitere Optimierung abgeschlossen! Neue Gesamtdistanz: {solution["objective_value"]:.1f}km'
             ]
-        }, timeout=3600)
+        }
+        cache.set(cache_key, progress, timeout=3600)
+        publish_optimization_progress(event_id, progress, progress['logs'])
 
         messages.success(
             request,
@@ -1344,7 +1690,7 @@ def run_additional_optimization(request, event_id):
         logger.error(f"Weitere Optimierung fehlgeschlagen: {e}")
 
         # Cache auf 'error' setzen
-        cache.set(cache_key, {
+        progress = {
             'step': 0,
             'total_steps': 3,
             'current_task': 'Fehler bei der Optimierung',
@@ -1353,7 +1699,9 @@ def run_additional_optimization(request, event_id):
             'timestamp': timezone.now().isoformat(),
             'error': str(e),
             'logs': [f'❌ Weitere Optimierung fehlgeschlagen: {str(e)}']
-        }, timeout=3600)
+        }
+        cache.set(cache_key, progress, timeout=3600)
+        publish_optimization_progress(event_id, progress, progress['logs'])
 
         messages.error(
             request, f'❌ Weitere Optimierung fehlgeschlagen: {str(e)}')
@@ -1,4 +1,7 @@
+from datetime import timedelta
+
 from django.contrib import admin
+from django.utils import timezone
 from .models import Address, Route, NavigationSession, LocationUpdate
 
 
@@ -24,6 +27,10 @@ class RouteAdmin(admin.ModelAdmin):
     search_fields = ['from_address__city', 'to_address__city']
     readonly_fields = ['last_updated', 'created_at']
 
+    def get_queryset(self, request):
+        # Große JSON-Spalten nicht für jede Listenzeile laden
+        return super().get_queryset(request).defer('route_geometry', 'turn_by_turn_directions')
+
 
 @admin.register(NavigationSession)
 class NavigationSessionAdmin(admin.ModelAdmin):
@@ -60,7 +67,10 @@ class LocationUpdateAdmin(admin.ModelAdmin):
     list_filter = ['is_moving', 'navigation_session__team',
                    'navigation_session__event']
     readonly_fields = ['timestamp']
+    # Kein unbegrenztes COUNT(*) über alle GPS-Punkte
+    show_full_result_count = False
 
     def get_queryset(self, request):
-        # Limitiere auf die letzten 1000 Einträge für bessere Performance
-        return super().get_queryset(request).order_by('-timestamp')[:1000]
+        # Nur die letzten 7 Tage - Zeitfenster nutzt den Index auf -timestamp
+        since = timezone.now() - timedelta(days=7)
+        return super().get_queryset(request).filter(timestamp__gte=since)
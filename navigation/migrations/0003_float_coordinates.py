@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2025-09-04 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("navigation", "0002_alter_navigationsession_preferred_transport_mode_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="address",
+            name="latitude",
+            field=models.FloatField(blank=True, null=True, verbose_name="Breitengrad"),
+        ),
+        migrations.AlterField(
+            model_name="address",
+            name="longitude",
+            field=models.FloatField(blank=True, null=True, verbose_name="Längengrad"),
+        ),
+        migrations.AlterField(
+            model_name="locationupdate",
+            name="latitude",
+            field=models.FloatField(verbose_name="Breitengrad"),
+        ),
+        migrations.AlterField(
+            model_name="locationupdate",
+            name="longitude",
+            field=models.FloatField(verbose_name="Längengrad"),
+        ),
+    ]
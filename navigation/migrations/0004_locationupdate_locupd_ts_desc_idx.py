@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2025-09-04 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("navigation", "0003_float_coordinates"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="locationupdate",
+            index=models.Index(fields=["-timestamp"], name="locupd_ts_desc_idx"),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated manually for performance optimization
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_brin_index(apps, schema_editor):
+    # BRIN gibt es nur auf PostgreSQL - GPS-Updates sind append-only und
+    # nach Einfügezeit geclustert, BRIN bleibt winzig und billig beim Schreiben
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS navigation_locationupdate_ts_brin "
+            "ON navigation_locationupdate USING BRIN(timestamp) WITH (pages_per_range=32);"
+        )
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS navigation_locationupdate_ts_brin;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("navigation", "0004_locationupdate_locupd_ts_desc_idx"),
+    ]
+
+    operations = [
+        # Zeitbereichs-Abfragen über alle Sessions
+        migrations.RunPython(create_brin_index, reverse_code=drop_brin_index),
+
+        # Letzte Updates pro Session - ersetzt den einfachen FK-Index
+        migrations.AddIndex(
+            model_name="locationupdate",
+            index=models.Index(
+                fields=["navigation_session", "-timestamp"], name="locupd_session_ts_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="locationupdate",
+            name="navigation_session",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="location_updates",
+                to="navigation.navigationsession",
+                verbose_name="Navigation-Session",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2025-09-04 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("navigation", "0005_locationupdate_time_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="route",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="route",
+            constraint=models.UniqueConstraint(
+                fields=("from_address", "to_address", "transport_mode"),
+                include=("distance_km", "duration_minutes", "is_cached", "cache_expires_at"),
+                name="route_lookup_covering",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2025-09-04 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("navigation", "0006_route_lookup_covering"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="navigationsession",
+            index=models.Index(
+                condition=models.Q(
+                    ("current_status__in", ["completed", "cancelled"]), _negated=True
+                ),
+                fields=["event", "current_status"],
+                name="navigation_session_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="navigationsession",
+            index=models.Index(
+                fields=["optimization_run", "team"], name="navsession_run_team_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2025-09-05 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("navigation", "0007_navigationsession_indexes"),
+    ]
+
+    operations = [
+        # UniqueConstraint mit include wird auf SQLite komplett übersprungen (models.W040)
+        migrations.RemoveConstraint(
+            model_name="route",
+            name="route_lookup_covering",
+        ),
+        migrations.AddConstraint(
+            model_name="route",
+            constraint=models.UniqueConstraint(
+                fields=("from_address", "to_address", "transport_mode"),
+                name="route_lookup_unique",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="route",
+            index=models.Index(
+                fields=["from_address", "to_address", "transport_mode"],
+                include=("distance_km", "duration_minutes", "is_cached", "cache_expires_at"),
+                name="route_lookup_covering_idx",
+            ),
+        ),
+    ]
@@ -15,12 +15,9 @@ class Address(models.Model):
         _('Land'), max_length=100, default='Deutschland')
 
     # Geocoding-Ergebnisse
-    latitude = models.DecimalField(
-        _('Breitengrad'), max_digits=10, decimal_places=8, null=True, blank=True
-    )
-    longitude = models.DecimalField(
-        _('Längengrad'), max_digits=11, decimal_places=8, null=True, blank=True
-    )
+    # float statt Decimal: GPS-Genauigkeit liegt weit unter float64-Präzision
+    latitude = models.FloatField(_('Breitengrad'), null=True, blank=True)
+    longitude = models.FloatField(_('Längengrad'), null=True, blank=True)
     geocoding_confidence = models.DecimalField(
         _('Geocoding-Konfidenz'), max_digits=3, decimal_places=2, null=True, blank=True,
         validators=[MinValueValidator(
@@ -67,7 +64,7 @@ class Address(models.Model):
     def get_coordinates(self):
         """Gibt Koordinaten als Tuple zurück"""
         if self.has_coordinates:
-            return (float(self.latitude), float(self.longitude))
+            return (self.latitude, self.longitude)
         return None
 
 
@@ -126,7 +123,22 @@ class Route(models.Model):
     class Meta:
         verbose_name = _('Route')
         verbose_name_plural = _('Routen')
-        unique_together = ['from_address', 'to_address', 'transport_mode']
+        constraints = [
+            # Ohne INCLUDE, damit die Eindeutigkeit auch auf SQLite greift
+            models.UniqueConstraint(
+                fields=['from_address', 'to_address', 'transport_mode'],
+                name='route_lookup_unique',
+            ),
+        ]
+        indexes = [
+            # Covering: Cache-Hit-Prüfungen (is_cache_valid) ohne Heap-Zugriff (nur PostgreSQL)
+            models.Index(
+                fields=['from_address', 'to_address', 'transport_mode'],
+                include=['distance_km', 'duration_minutes',
+                         'is_cached', 'cache_expires_at'],
+                name='route_lookup_covering_idx',
+            ),
+        ]
         ordering = ['distance_km']
 
     def __str__(self):
@@ -165,6 +177,16 @@ class NavigationSession(models.Model):
         ('cancelled', _('Abgebrochen')),
     ]
 
+    # Status → Host-Feld des nächsten Ziels im TeamAssignment
+    _NEXT_HOST_MAP = {
+        'preparing': 'hosts_appetizer',
+        'appetizer_travel': 'hosts_appetizer',
+        'at_appetizer': 'hosts_main_course',
+        'main_course_travel': 'hosts_main_course',
+        'at_main_course': 'hosts_dessert',
+        'dessert_travel': 'hosts_dessert',
+    }
+
     team = models.ForeignKey(
         'accounts.Team', on_delete=models.CASCADE, related_name='navigation_sessions', verbose_name=_('Team')
     )
@@ -218,6 +240,15 @@ class NavigationSession(models.Model):
         verbose_name_plural = _('Navigation-Sessions')
         unique_together = ['team', 'event']
         ordering = ['-created_at']
+        indexes = [
+            # Nur laufende Sessions - abgeschlossene landen nicht im Index
+            models.Index(
+                fields=['event', 'current_status'], name='navigation_session_active_idx',
+                condition=~models.Q(current_status__in=['completed', 'cancelled'])
+            ),
+            # TeamAssignment-Lookup in get_next_destination
+            models.Index(fields=['optimization_run', 'team'], name='navsession_run_team_idx'),
+        ]
 
     def __str__(self):
         return f"{self.team.name} - {self.event.name} ({self.get_current_status_display()})"
@@ -226,35 +257,42 @@ class NavigationSession(models.Model):
     def is_active(self):
         return self.current_status not in ['completed', 'cancelled']
 
+    def _get_team_assignment(self):
+        """TeamAssignment des Teams im Lauf - pro Instanz nur einmal geladen"""
+        if '_team_assignment_cache' not in self.__dict__:
+            from optimization.models import TeamAssignment
+            try:
+                assignment = TeamAssignment.objects.select_related(
+                    'hosts_appetizer', 'hosts_main_course', 'hosts_dessert'
+                ).get(optimization_run_id=self.optimization_run_id, team_id=self.team_id)
+            except TeamAssignment.DoesNotExist:
+                assignment = None
+            self.__dict__['_team_assignment_cache'] = assignment
+        return self.__dict__['_team_assignment_cache']
+
     def get_next_destination(self):
         """Gibt das nächste Ziel basierend auf dem aktuellen Status zurück"""
-        from optimization.models import TeamAssignment
-        try:
-            assignment = TeamAssignment.objects.get(
-                optimization_run=self.optimization_run, team=self.team)
-
-            if self.current_status in ['preparing', 'appetizer_travel']:
-                return assignment.hosts_appetizer
-            elif self.current_status in ['at_appetizer', 'main_course_travel']:
-                return assignment.hosts_main_course
-            elif self.current_status in ['at_main_course', 'dessert_travel']:
-                return assignment.hosts_dessert
-        except TeamAssignment.DoesNotExist:
-            pass
-        return None
+        host_field = self._NEXT_HOST_MAP.get(self.current_status)
+        if host_field is None:
+            return None
+
+        assignment = self._get_team_assignment()
+        if assignment is None:
+            return None
+        return getattr(assignment, host_field)
 
 
 class LocationUpdate(models.Model):
     """Modell für GPS-Updates während der Navigation"""
 
+    # db_index=False: abgedeckt durch locupd_session_ts_idx (navigation_session, -timestamp)
     navigation_session = models.ForeignKey(
-        NavigationSession, on_delete=models.CASCADE, related_name='location_updates', verbose_name=_('Navigation-Session')
+        NavigationSession, on_delete=models.CASCADE, related_name='location_updates', verbose_name=_('Navigation-Session'),
+        db_index=False
     )
 
-    latitude = models.DecimalField(
-        _('Breitengrad'), max_digits=10, decimal_places=8)
-    longitude = models.DecimalField(
-        _('Längengrad'), max_digits=11, decimal_places=8)
+    latitude = models.FloatField(_('Breitengrad'))
+    longitude = models.FloatField(_('Längengrad'))
     accuracy_meters = models.DecimalField(
         _('Genauigkeit (Meter)'), max_digits=8, decimal_places=2, null=True, blank=True)
     speed_kmh = models.DecimalField(
@@ -279,10 +317,14 @@ class LocationUpdate(models.Model):
         verbose_name = _('Standort-Update')
         verbose_name_plural = _('Standort-Updates')
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['-timestamp'], name='locupd_ts_desc_idx'),
+            models.Index(fields=['navigation_session', '-timestamp'], name='locupd_session_ts_idx'),
+        ]
 
     def __str__(self):
         return f"{self.navigation_session.team.name} - {self.timestamp.strftime('%H:%M:%S')}"
 
     def get_coordinates(self):
         """Gibt Koordinaten als Tuple zurück"""
-        return (float(self.latitude), float(self.longitude))
+        return (self.latitude, self.longitude)
@@ -1,12 +1,21 @@
 from django.contrib import admin
-from .models import OptimizationRun, TeamAssignment, OptimizationConstraint
+from .models import OptimizationRun, OptimizationRunLog, TeamAssignment, OptimizationConstraint
+
+
+class OptimizationRunLogInline(admin.StackedInline):
+    model = OptimizationRunLog
+    readonly_fields = ['data']
+    can_delete = False
+    extra = 0
 
 
 @admin.register(OptimizationRun)
 class OptimizationRunAdmin(admin.ModelAdmin):
+    inlines = [OptimizationRunLogInline]
     list_display = ['event', 'status', 'algorithm',
                     'total_distance', 'objective_value', 'created_at']
     list_filter = ['status', 'algorithm', 'created_at']
+    list_select_related = ['event']
     search_fields = ['event__name']
     readonly_fields = ['total_distance', 'objective_value',
                        'iterations_completed', 'execution_time', 'started_at', 'completed_at']
@@ -33,6 +42,9 @@ class OptimizationRunAdmin(admin.ModelAdmin):
 class TeamAssignmentAdmin(admin.ModelAdmin):
     list_display = ['team', 'course', 'optimization_run', 'total_distance']
     list_filter = ['course', 'optimization_run__event']
+    # __str__ von Team und OptimizationRun (event.name) ohne N+1 rendern
+    list_select_related = ['team', 'optimization_run__event']
+    ordering = ['team__name']
     search_fields = ['team__name', 'optimization_run__event__name']
     readonly_fields = ['total_distance', 'distance_to_appetizer',
                        'distance_to_main_course', 'distance_to_dessert']
@@ -43,4 +55,5 @@ class OptimizationConstraintAdmin(admin.ModelAdmin):
     list_display = ['name', 'constraint_type',
                     'optimization_run', 'is_hard_constraint', 'is_active']
     list_filter = ['constraint_type', 'is_hard_constraint', 'is_active']
+    list_select_related = ['optimization_run__event']
     search_fields = ['name', 'optimization_run__event__name']
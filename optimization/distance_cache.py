@@ -0,0 +1,138 @@
+"""
+Event-weiter Cache für die Team-Entfernungsmatrix
+Einmal berechnet, wiederverwendet über OptimizationRuns und weitere Optimierungen
+
+Die Matrix liegt als .npy unter settings.DISTANCE_MATRIX_DIR (nicht öffentlich ausgeliefert)
+und wird read-only per mmap geladen - alle Worker teilen sich so eine Kopie im Page-Cache.
+"""
+
+import hashlib
+import logging
+import glob
+import os
+import time
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Gleiche Lebensdauer wie die einzelnen Routen im RouteCalculator
+MATRIX_TIMEOUT = 3600 * 24
+
+# Fallback-Entfernung (km) für Paare ohne Routing-Ergebnis
+FALLBACK_DISTANCE_KM = 2.5
+
+# Offene mmaps pro Prozess: path -> (mtime, array)
+MAX_OPEN_MATRICES = 16
+_open_matrices = {}
+
+
+def _teams_fingerprint(teams) -> str:
+    """SHA1 über Teams inkl. Adresse/Koordinaten - ein Umzug ergibt einen neuen Key"""
+    parts = sorted(
+        f"{team.pk}|{team.home_address}|{team.latitude}|{team.longitude}" for team in teams
+    )
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+
+def _build_matrix(teams) -> np.ndarray:
+    """Berechnet die Matrix über den RouteCalculator (Teams nach pk sortiert)"""
+    from events.routing import get_route_calculator
+
+    distances = get_route_calculator().calculate_team_distances(teams)
+    team_ids = [team.pk for team in teams]
+
+    matrix = np.full((len(team_ids), len(team_ids)), FALLBACK_DISTANCE_KM, dtype=np.float32)
+    missing = 0
+    for i, id1 in enumerate(team_ids):
+        for j, id2 in enumerate(team_ids):
+            distance = distances.get((id1, id2))
+            if distance is None:
+                missing += 1
+            else:
+                matrix[i, j] = distance
+
+    if missing:
+        logger.warning(f"⚠️ {missing} Entfernungen mit Fallback-Werten ergänzt")
+    return matrix
+
+
+def _matrix_path(event_id, fingerprint) -> str:
+    """DISTANCE_MATRIX_DIR/{event_id}_{sha1}.npy"""
+    return os.path.join(settings.DISTANCE_MATRIX_DIR, f"{event_id}_{fingerprint}.npy")
+
+
+def _remove_stale_matrices(event_id, keep_path):
+    """Ältere Matrizen des Events löschen (geänderte Teams ergeben einen neuen Dateinamen)"""
+    pattern = os.path.join(settings.DISTANCE_MATRIX_DIR, f"{event_id}_*.npy")
+    for path in glob.glob(pattern):
+        if path == keep_path:
+            continue
+        # Eigenes Handle freigeben, damit die gelöschte Datei nicht gemappt bleibt.
+        # mmaps anderer Worker verwerfen diese beim nächsten Zugriff über die mtime
+        _open_matrices.pop(path, None)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _open_mmap(path, mtime) -> np.ndarray:
+    """Read-only mmap Handle pro Prozess - bei geänderter mtime neu öffnen"""
+    cached = _open_matrices.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    _open_matrices.pop(path, None)
+    if len(_open_matrices) >= MAX_OPEN_MATRICES:
+        # Ältesten Eintrag schließen (dict behält die Einfügereihenfolge)
+        _open_matrices.pop(next(iter(_open_matrices)))
+
+    matrix = np.load(path, mmap_mode='r')
+    _open_matrices[path] = (mtime, matrix)
+    return matrix
+
+
+def _save_matrix(path, matrix):
+    """Atomar schreiben, damit parallele Worker nie eine halbe Datei lesen"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, matrix)
+    os.replace(tmp_path, path)
+
+
+def get_matrix(event, teams) -> np.ndarray:
+    """
+    float32 N×N Entfernungsmatrix (km) in der Reihenfolge von `teams`
+    Datei: DISTANCE_MATRIX_DIR/{event.pk}_{sha1(teams)}.npy
+
+    Teams nach pk sortiert übergeben - dann wird die geteilte mmap direkt
+    zurückgegeben, jede andere Reihenfolge erzeugt eine private Kopie.
+    """
+    teams = list(teams)
+    ordered = sorted(teams, key=lambda team: team.pk)
+
+    path = _matrix_path(event.pk, _teams_fingerprint(teams))
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+
+    if mtime is None or time.time() - mtime > MATRIX_TIMEOUT:
+        _save_matrix(path, _build_matrix(ordered))
+        mtime = os.path.getmtime(path)
+        _remove_stale_matrices(event.pk, path)
+        logger.info(f"🧮 Entfernungsmatrix für {len(teams)} Teams berechnet und gespeichert")
+    else:
+        logger.info(f"🧮 Entfernungsmatrix für {len(teams)} Teams aus mmap")
+
+    matrix = _open_mmap(path, mtime)
+    if all(a is b for a, b in zip(teams, ordered)):
+        return matrix
+
+    # Zeilen/Spalten auf die Reihenfolge des Aufrufers umsortieren (Kopie)
+    position = {team.pk: i for i, team in enumerate(ordered)}
+    idx = np.fromiter((position[team.pk] for team in teams), dtype=np.intp, count=len(teams))
+    return matrix[np.ix_(idx, idx)]
@@ -0,0 +1,23 @@
+# Generated manually for performance optimization
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('optimization', '0002_performance_indexes'),
+    ]
+
+    operations = [
+        # "Letzter abgeschlossener Lauf" - filter(status='completed').order_by('-completed_at')
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS opt_run_event_completed_status_idx ON optimization_optimizationrun(event_id, completed_at DESC) WHERE status = 'completed';",
+            reverse_sql="DROP INDEX IF EXISTS opt_run_event_completed_status_idx;"
+        ),
+        # Durch den partiellen Index oben abgedeckt
+        migrations.RunSQL(
+            "DROP INDEX IF EXISTS optimization_optimizationrun_event_completed_idx;",
+            reverse_sql="CREATE INDEX IF NOT EXISTS optimization_optimizationrun_event_completed_idx ON optimization_optimizationrun(event_id, completed_at DESC) WHERE completed_at IS NOT NULL;"
+        ),
+    ]
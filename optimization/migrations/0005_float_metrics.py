@@ -0,0 +1,115 @@
+# Generated by Django 5.2.5 on 2025-09-05 09:15
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("optimization", "0003_completed_run_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="optimizationrun",
+            name="balance_weight",
+            field=models.FloatField(
+                default=0.3,
+                help_text="Gewichtung für Kursverteilung (0.0-1.0)",
+                validators=[
+                    django.core.validators.MinValueValidator(0.0),
+                    django.core.validators.MaxValueValidator(1.0),
+                ],
+                verbose_name="Ausgewogenheit Gewichtung",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="optimizationrun",
+            name="execution_time",
+            field=models.FloatField(
+                blank=True, null=True, verbose_name="Ausführungszeit (Sekunden)"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="optimizationrun",
+            name="max_distance_weight",
+            field=models.FloatField(
+                default=0.4,
+                help_text="Gewichtung für Entfernungsminimierung (0.0-1.0)",
+                validators=[
+                    django.core.validators.MinValueValidator(0.0),
+                    django.core.validators.MaxValueValidator(1.0),
+                ],
+                verbose_name="Entfernung Gewichtung",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="optimizationrun",
+            name="objective_value",
+            field=models.FloatField(
+                blank=True,
+                help_text="Gesamtbewertung der Lösung",
+                null=True,
+                verbose_name="Zielfunktionswert",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="optimizationrun",
+            name="preference_weight",
+            field=models.FloatField(
+                default=0.3,
+                help_text="Gewichtung für Team-Präferenzen (0.0-1.0)",
+                validators=[
+                    django.core.validators.MinValueValidator(0.0),
+                    django.core.validators.MaxValueValidator(1.0),
+                ],
+                verbose_name="Präferenz Gewichtung",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="optimizationrun",
+            name="total_distance",
+            field=models.FloatField(
+                blank=True, null=True, verbose_name="Gesamtentfernung (km)"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="teamassignment",
+            name="distance_to_appetizer",
+            field=models.FloatField(
+                blank=True, null=True, verbose_name="Entfernung zur Vorspeise (km)"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="teamassignment",
+            name="distance_to_dessert",
+            field=models.FloatField(
+                blank=True, null=True, verbose_name="Entfernung zur Nachspeise (km)"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="teamassignment",
+            name="distance_to_main_course",
+            field=models.FloatField(
+                blank=True, null=True, verbose_name="Entfernung zum Hauptgang (km)"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="teamassignment",
+            name="preference_score",
+            field=models.FloatField(
+                blank=True,
+                help_text="Bewertung wie gut Präferenzen erfüllt wurden",
+                null=True,
+                verbose_name="Präferenz-Score",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="teamassignment",
+            name="total_distance",
+            field=models.FloatField(
+                blank=True, null=True, verbose_name="Gesamtentfernung (km)"
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2025-09-05 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("optimization", "0005_float_metrics"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="optimizationrun",
+            index=models.Index(
+                fields=["event", "-created_at"], name="optrun_event_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="optimizationrun",
+            index=models.Index(
+                fields=["event", "status"], name="optrun_event_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="teamassignment",
+            index=models.Index(
+                fields=["optimization_run", "course"], name="teamassign_run_course_idx"
+            ),
+        ),
+        # Manuelle Indizes aus 0002 sind jetzt durch Meta.indexes bzw. unique_together abgedeckt
+        migrations.RunSQL(
+            "DROP INDEX IF EXISTS optimization_optimizationrun_event_status_idx;",
+            reverse_sql="CREATE INDEX IF NOT EXISTS optimization_optimizationrun_event_status_idx ON optimization_optimizationrun(event_id, status);"
+        ),
+        migrations.RunSQL(
+            "DROP INDEX IF EXISTS optimization_teamassignment_optimization_course_idx;",
+            reverse_sql="CREATE INDEX IF NOT EXISTS optimization_teamassignment_optimization_course_idx ON optimization_teamassignment(optimization_run_id, course);"
+        ),
+        migrations.RunSQL(
+            "DROP INDEX IF EXISTS optimization_teamassignment_optimization_team_idx;",
+            reverse_sql="CREATE INDEX IF NOT EXISTS optimization_teamassignment_optimization_team_idx ON optimization_teamassignment(optimization_run_id, team_id);"
+        ),
+    ]
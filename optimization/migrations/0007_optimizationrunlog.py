@@ -0,0 +1,76 @@
+# Generated by Django 5.2.5 on 2025-09-05 10:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_log_data(apps, schema_editor):
+    """Bestehende log_data in die neue Tabelle übernehmen"""
+    OptimizationRun = apps.get_model('optimization', 'OptimizationRun')
+    OptimizationRunLog = apps.get_model('optimization', 'OptimizationRunLog')
+    OptimizationRunLog.objects.bulk_create(
+        [
+            OptimizationRunLog(run_id=run_id, data=log_data)
+            for run_id, log_data in OptimizationRun.objects.exclude(
+                log_data={}).values_list('id', 'log_data').iterator()
+        ],
+        batch_size=500,
+    )
+
+
+def restore_log_data(apps, schema_editor):
+    OptimizationRun = apps.get_model('optimization', 'OptimizationRun')
+    OptimizationRunLog = apps.get_model('optimization', 'OptimizationRunLog')
+    for run_id, data in OptimizationRunLog.objects.values_list('run_id', 'data').iterator():
+        OptimizationRun.objects.filter(pk=run_id).update(log_data=data)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("optimization", "0006_run_assignment_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OptimizationRunLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Detaillierte Algorithmus-Logs",
+                        verbose_name="Log-Daten",
+                    ),
+                ),
+                (
+                    "run",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="log",
+                        to="optimization.optimizationrun",
+                        verbose_name="Optimierungslauf",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Optimierungs-Log",
+                "verbose_name_plural": "Optimierungs-Logs",
+            },
+        ),
+        migrations.RunPython(copy_log_data, restore_log_data),
+        migrations.RemoveField(
+            model_name="optimizationrun",
+            name="log_data",
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.5 on 2025-09-05 11:40
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+
+# Rundungstoleranz für den Backfill (4 Summanden à max. 0.005 km Rundungsfehler)
+AFTERPARTY_EPSILON_KM = 0.05
+
+
+def backfill_afterparty_distance(apps, schema_editor):
+    """Bisherige Gesamtentfernungen enthalten die Afterparty-Strecke - als Differenz übernehmen"""
+    TeamAssignment = apps.get_model('optimization', 'TeamAssignment')
+    TeamAssignment.objects.filter(total_distance__isnull=False).update(
+        distance_to_afterparty=F('total_distance')
+        - Coalesce(F('distance_to_appetizer'), Value(0.0))
+        - Coalesce(F('distance_to_main_course'), Value(0.0))
+        - Coalesce(F('distance_to_dessert'), Value(0.0))
+    )
+    # Alte Werte waren auf 2 Nachkommastellen gerundet - Rundungsreste sind keine Afterparty-Strecke
+    TeamAssignment.objects.filter(distance_to_afterparty__lt=AFTERPARTY_EPSILON_KM).update(
+        distance_to_afterparty=0.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("optimization", "0007_optimizationrunlog"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="teamassignment",
+            name="distance_to_afterparty",
+            field=models.FloatField(
+                blank=True, null=True, verbose_name="Entfernung zur Afterparty (km)"
+            ),
+        ),
+        migrations.RunPython(
+            backfill_afterparty_distance, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.RemoveField(
+            model_name="teamassignment",
+            name="total_distance",
+        ),
+        migrations.AddField(
+            model_name="teamassignment",
+            name="total_distance",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.comparison.Coalesce(
+                    "distance_to_appetizer", 0.0
+                )
+                + django.db.models.functions.comparison.Coalesce(
+                    "distance_to_main_course", 0.0
+                )
+                + django.db.models.functions.comparison.Coalesce(
+                    "distance_to_dessert", 0.0
+                )
+                + django.db.models.functions.comparison.Coalesce(
+                    "distance_to_afterparty", 0.0
+                ),
+                output_field=models.FloatField(),
+                verbose_name="Gesamtentfernung (km)",
+            ),
+        ),
+        # Index aus 0002 fällt mit der alten Spalte weg
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS optimization_teamassignment_distance_idx ON optimization_teamassignment(total_distance);",
+            reverse_sql="DROP INDEX IF EXISTS optimization_teamassignment_distance_idx;"
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2025-09-05 12:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("optimization", "0008_generated_total_distance"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="teamassignment",
+            options={
+                "verbose_name": "Team-Zuweisung",
+                "verbose_name_plural": "Team-Zuweisungen",
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2025-09-06 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("optimization", "0009_alter_teamassignment_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="teamassignment",
+            name="email_sent_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="E-Mail versendet am"
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
@@ -30,31 +31,22 @@ class OptimizationRun(models.Model):
     )
 
     # Optimierungsparameter
-    max_distance_weight = models.DecimalField(
+    max_distance_weight = models.FloatField(
         _('Entfernung Gewichtung'),
-        max_digits=3,
-        decimal_places=2,
-        default=Decimal('0.4'),
-        validators=[MinValueValidator(
-            Decimal('0.0')), MaxValueValidator(Decimal('1.0'))],
+        default=0.4,
+        validators=[MinValueValidator(0.0), MaxValueValidator(1.0)],
         help_text=_('Gewichtung für Entfernungsminimierung (0.0-1.0)')
     )
-    preference_weight = models.DecimalField(
+    preference_weight = models.FloatField(
         _('Präferenz Gewichtung'),
-        max_digits=3,
-        decimal_places=2,
-        default=Decimal('0.3'),
-        validators=[MinValueValidator(
-            Decimal('0.0')), MaxValueValidator(Decimal('1.0'))],
+        default=0.3,
+        validators=[MinValueValidator(0.0), MaxValueValidator(1.0)],
         help_text=_('Gewichtung für Team-Präferenzen (0.0-1.0)')
     )
-    balance_weight = models.DecimalField(
+    balance_weight = models.FloatField(
         _('Ausgewogenheit Gewichtung'),
-        max_digits=3,
-        decimal_places=2,
-        default=Decimal('0.3'),
-        validators=[MinValueValidator(
-            Decimal('0.0')), MaxValueValidator(Decimal('1.0'))],
+        default=0.3,
+        validators=[MinValueValidator(0.0), MaxValueValidator(1.0)],
         help_text=_('Gewichtung für Kursverteilung (0.0-1.0)')
     )
 
@@ -82,17 +74,13 @@ class OptimizationRun(models.Model):
     )
 
     # Ergebnisse
-    total_distance = models.DecimalField(
+    total_distance = models.FloatField(
         _('Gesamtentfernung (km)'),
-        max_digits=8,
-        decimal_places=2,
         null=True,
         blank=True
     )
-    objective_value = models.DecimalField(
+    objective_value = models.FloatField(
         _('Zielfunktionswert'),
-        max_digits=10,
-        decimal_places=4,
         null=True,
         blank=True,
         help_text=_('Gesamtbewertung der Lösung')
@@ -102,10 +90,8 @@ class OptimizationRun(models.Model):
         null=True,
         blank=True
     )
-    execution_time = models.DecimalField(
+    execution_time = models.FloatField(
         _('Ausführungszeit (Sekunden)'),
-        max_digits=8,
-        decimal_places=2,
         null=True,
         blank=True
     )
@@ -125,13 +111,6 @@ class OptimizationRun(models.Model):
         _('Fehlermeldung'),
         blank=True
     )
-    log_data = models.JSONField(
-        _('Log-Daten'),
-        default=dict,
-        blank=True,
-        help_text=_('Detaillierte Algorithmus-Logs')
-    )
-
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -139,6 +118,11 @@ class OptimizationRun(models.Model):
         verbose_name = _('Optimierungslauf')
         verbose_name_plural = _('Optimierungsläufe')
         ordering = ['-created_at']
+        indexes = [
+            # Läufe eines Events, neueste zuerst
+            models.Index(fields=['event', '-created_at'], name='optrun_event_created_idx'),
+            models.Index(fields=['event', 'status'], name='optrun_event_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.event.name} - {self.get_status_display()} ({self.created_at.strftime('%d.%m.%Y %H:%M')})"
@@ -152,6 +136,30 @@ class OptimizationRun(models.Model):
         return self.status == 'completed'
 
 
+class OptimizationRunLog(models.Model):
+    """Algorithmus-Logs eines Laufs - getrennt, damit OptimizationRun-Zeilen schmal bleiben"""
+
+    run = models.OneToOneField(
+        OptimizationRun,
+        on_delete=models.CASCADE,
+        related_name='log',
+        verbose_name=_('Optimierungslauf')
+    )
+    data = models.JSONField(
+        _('Log-Daten'),
+        default=dict,
+        blank=True,
+        help_text=_('Detaillierte Algorithmus-Logs')
+    )
+
+    class Meta:
+        verbose_name = _('Optimierungs-Log')
+        verbose_name_plural = _('Optimierungs-Logs')
+
+    def __str__(self):
+        return f"Log: {self.run}"
+
+
 class TeamAssignment(models.Model):
     """Modell für die Zuweisungen von Teams zu Kursen und Hosts"""
 
@@ -212,40 +220,42 @@ class TeamAssignment(models.Model):
     )
 
     # Berechnete Entfernungen
-    distance_to_appetizer = models.DecimalField(
+    distance_to_appetizer = models.FloatField(
         _('Entfernung zur Vorspeise (km)'),
-        max_digits=6,
-        decimal_places=2,
         null=True,
         blank=True
     )
-    distance_to_main_course = models.DecimalField(
+    distance_to_main_course = models.FloatField(
         _('Entfernung zum Hauptgang (km)'),
-        max_digits=6,
-        decimal_places=2,
         null=True,
         blank=True
     )
-    distance_to_dessert = models.DecimalField(
+    distance_to_dessert = models.FloatField(
         _('Entfernung zur Nachspeise (km)'),
-        max_digits=6,
-        decimal_places=2,
         null=True,
         blank=True
     )
-    total_distance = models.DecimalField(
-        _('Gesamtentfernung (km)'),
-        max_digits=6,
-        decimal_places=2,
+    distance_to_afterparty = models.FloatField(
+        _('Entfernung zur Afterparty (km)'),
         null=True,
         blank=True
     )
+    # Von der Datenbank beim Schreiben berechnet - kann nicht mehr auseinanderlaufen
+    total_distance = models.GeneratedField(
+        expression=(
+            Coalesce('distance_to_appetizer', 0.0)
+            + Coalesce('distance_to_main_course', 0.0)
+            + Coalesce('distance_to_dessert', 0.0)
+            + Coalesce('distance_to_afterparty', 0.0)
+        ),
+        output_field=models.FloatField(),
+        db_persist=True,
+        verbose_name=_('Gesamtentfernung (km)')
+    )
 
     # Bewertungen
-    preference_score = models.DecimalField(
+    preference_score = models.FloatField(
         _('Präferenz-Score'),
-        max_digits=5,
-        decimal_places=2,
         null=True,
         blank=True,
         help_text=_('Bewertung wie gut Präferenzen erfüllt wurden')
@@ -257,13 +267,37 @@ class TeamAssignment(models.Model):
         help_text=_('Liste der verletzten Einschränkungen')
     )
 
+    # Zeitpunkt der Zuteilungs-E-Mail - ein erneuter Versand überspringt diese Teams
+    email_sent_at = models.DateTimeField(
+        _('E-Mail versendet am'),
+        null=True,
+        blank=True
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name = _('Team-Zuweisung')
         verbose_name_plural = _('Team-Zuweisungen')
+        # unique_together deckt auch Lookups über (optimization_run, team) ab
         unique_together = ['optimization_run', 'team']
-        ordering = ['team__name']
+        # Keine Default-Sortierung: ordering = ['team__name'] erzwang JOIN + Sort bei jeder Abfrage.
+        # Anzeigen sortieren explizit mit .order_by('team__name')
+        indexes = [
+            models.Index(fields=['optimization_run', 'course'], name='teamassign_run_course_idx'),
+        ]
+
+    # Kurs → Host-/Entfernungsfeld
+    _HOST_FIELD_MAP = {
+        'appetizer': 'hosts_appetizer',
+        'main_course': 'hosts_main_course',
+        'dessert': 'hosts_dessert',
+    }
+    _DISTANCE_FIELD_MAP = {
+        'appetizer': 'distance_to_appetizer',
+        'main_course': 'distance_to_main_course',
+        'dessert': 'distance_to_dessert',
+    }
 
     def __str__(self):
         return f"{self.team.name} - {self.get_course_display()}"
@@ -271,23 +305,13 @@ class TeamAssignment(models.Model):
     @property
     def hosting_team(self):
         """Gibt das Team zurück, bei dem dieses Team für seinen zugewiesenen Kurs ist"""
-        if self.course == 'appetizer':
-            return self.hosts_appetizer
-        elif self.course == 'main_course':
-            return self.hosts_main_course
-        elif self.course == 'dessert':
-            return self.hosts_dessert
-        return None
+        host_field = self._HOST_FIELD_MAP.get(self.course)
+        return getattr(self, host_field) if host_field else None
 
     def get_distance_for_course(self, course):
         """Gibt die Entfernung für einen bestimmten Kurs zurück"""
-        if course == 'appetizer':
-            return self.distance_to_appetizer
-        elif course == 'main_course':
-            return self.distance_to_main_course
-        elif course == 'dessert':
-            return self.distance_to_dessert
-        return None
+        distance_field = self._DISTANCE_FIELD_MAP.get(course)
+        return getattr(self, distance_field) if distance_field else None
 
 
 class OptimizationConstraint(models.Model):
@@ -1,3 +1,93 @@
+from datetime import timedelta
+from decimal import Decimal
+
 from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import CustomUser, Team
+from events.models import Event
+
+from .models import OptimizationRun, TeamAssignment
+
+
+class TeamAssignmentBulkWriteTests(TestCase):
+    """Schreibpfad von start_optimization: bulk_create für Zuweisungen und Gäste"""
+
+    def setUp(self):
+        organizer = CustomUser.objects.create_user(
+            username='organizer', email='organizer@test.com', password='testpass123')
+        self.event = Event.objects.create(
+            name='Test Event',
+            description='Running Dinner für Tests',
+            organizer=organizer,
+            event_date=timezone.now().date() + timedelta(days=30),
+            registration_start=timezone.now() - timedelta(days=10),
+            registration_deadline=timezone.now() + timedelta(days=20),
+            max_teams=50,
+            team_size=2,
+            groups_per_course=3,
+            price_per_person=Decimal('25.00'),
+            city='Munich',
+            max_distance_km=Decimal('15.00'),
+        )
+        self.teams = [
+            Team.objects.create(
+                name=f'TestTeam{i:04d}',
+                contact_person=organizer,
+                home_address=f'Teststraße {i}, München',
+                latitude=Decimal('48.1351000'),
+                longitude=Decimal('11.5820000'),
+            )
+            for i in range(3)
+        ]
+        self.run = OptimizationRun.objects.create(event=self.event, status='running')
+
+    def _bulk_create_assignments(self):
+        courses = ['appetizer', 'main_course', 'dessert']
+        assignments = [
+            TeamAssignment(
+                optimization_run=self.run,
+                team=team,
+                course=course,
+                hosts_appetizer=self.teams[0],
+                hosts_main_course=self.teams[1],
+                hosts_dessert=self.teams[2],
+                distance_to_appetizer=1.5,
+                distance_to_main_course=2.0,
+                distance_to_dessert=None,
+                distance_to_afterparty=0.5,
+            )
+            for team, course in zip(self.teams, courses)
+        ]
+        TeamAssignment.objects.bulk_create(assignments, batch_size=500)
+        return assignments
+
+    def test_bulk_create_persists_all_rows_with_pks(self):
+        assignments = self._bulk_create_assignments()
+
+        # Gast-Links brauchen die Primärschlüssel aus dem bulk_create
+        self.assertTrue(all(assignment.pk for assignment in assignments))
+        self.assertEqual(
+            TeamAssignment.objects.filter(optimization_run=self.run).count(), 3)
+
+    def test_total_distance_is_generated_by_database(self):
+        self._bulk_create_assignments()
+
+        # NULL-Entfernungen zählen als 0 (Coalesce im GeneratedField)
+        totals = set(TeamAssignment.objects.filter(
+            optimization_run=self.run).values_list('total_distance', flat=True))
+        self.assertEqual(totals, {4.0})
+
+    def test_guest_links_bulk_create(self):
+        assignments = self._bulk_create_assignments()
+        GuestLink = TeamAssignment.guests.through
+        host = assignments[0]
+
+        GuestLink.objects.bulk_create([
+            GuestLink(teamassignment_id=host.pk, team_id=guest.pk)
+            for guest in self.teams[1:]
+        ], batch_size=500)
 
-# Create your tests here.
+        self.assertEqual(
+            set(host.guests.values_list('pk', flat=True)),
+            {team.pk for team in self.teams[1:]})
@@ -2,34 +2,52 @@
 """
 Simple script to run Django development server without Docker
 """
+import asyncio
 import os
 import sys
 import subprocess
 import time
 
-def check_service(host, port, service_name):
+async def check_service_async(host, port, service_name, timeout=2):
     """Check if a service is running"""
-    import socket
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(2)
-        result = sock.connect_ex((host, port))
-        sock.close()
-        if result == 0:
-            print(f"✅ {service_name} is running on {host}:{port}")
-            return True
-        else:
-            print(f"❌ {service_name} is not running on {host}:{port}")
-            return False
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        writer.close()
+        await writer.wait_closed()
+        print(f"✅ {service_name} is running on {host}:{port}")
+        return True
+    except (OSError, asyncio.TimeoutError):
+        print(f"❌ {service_name} is not running on {host}:{port}")
+        return False
     except Exception as e:
         print(f"❌ Error checking {service_name}: {e}")
         return False
 
+async def check_services():
+    """PostgreSQL und Redis parallel prüfen - Wartezeit max(t1, t2) statt t1 + t2"""
+    return await asyncio.gather(
+        check_service_async('localhost', 5432, 'PostgreSQL'),
+        check_service_async('localhost', 6379, 'Redis'),
+    )
+
+def run_management_command(name, step, **options):
+    """Management-Command im Prozess - Fehler melden statt den Launcher abzubrechen"""
+    from django.core.management import CommandError, call_command
+    from django.db import DatabaseError
+    try:
+        call_command(name, **options)
+        return True
+    except (CommandError, DatabaseError) as e:
+        print(f"❌ Error {step}: {e}")
+        return False
+
 def main():
     print("🚀 Starting Running Dinner Development Server...")
     
+    postgres_running, redis_running = asyncio.run(check_services())
+    
     # Check if PostgreSQL is running
-    if not check_service('localhost', 5432, 'PostgreSQL'):
+    if not postgres_running:
         print("\n📋 Please start PostgreSQL first:")
         print("   Option 1: Use CodeSpace services (if available)")
         print("   Option 2: Install PostgreSQL locally")
@@ -44,7 +62,7 @@ def main():
             sys.exit(1)
     
     # Check if Redis is running (optional)
-    if not check_service('localhost', 6379, 'Redis'):
+    if not redis_running:
         print("⚠️  Redis not available - using database for sessions")
         os.environ['USE_DB_SESSIONS'] = 'True'
     
@@ -59,19 +77,24 @@ def main():
         print("📦 Installing Python dependencies...")
         subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
     
+    # Django einmal im selben Interpreter laden - migrate/collectstatic ohne eigene Prozesse
+    import django
+    django.setup()
+    
     # Run migrations
     print("🗄️  Running database migrations...")
-    subprocess.run([sys.executable, 'manage.py', 'migrate'])
+    run_management_command('migrate', 'running migrations')
     
     # Collect static files
     print("📦 Collecting static files...")
-    subprocess.run([sys.executable, 'manage.py', 'collectstatic', '--noinput'])
+    run_management_command('collectstatic', 'collecting static files', interactive=False)
     
     # Start development server
     print("🎉 Starting Django development server...")
     print("📱 Server will be available at: http://localhost:8000")
     print("📍 Admin interface: http://localhost:8000/admin")
     
+    # runserver bleibt ein eigener Prozess: der Autoreloader startet sys.argv neu
     try:
         subprocess.run([sys.executable, 'manage.py', 'runserver', '0.0.0.0:8000'])
     except KeyboardInterrupt:
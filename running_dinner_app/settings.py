@@ -161,6 +161,11 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Entfernungsmatrizen der Optimierung (optimization.distance_cache) - bewusst außerhalb
+# von MEDIA_ROOT, da nginx /media/ öffentlich ausliefert
+DISTANCE_MATRIX_DIR = config(
+    'DISTANCE_MATRIX_DIR', default=os.path.join(BASE_DIR, 'var', 'distmats'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -17,30 +17,40 @@ Including another URLconf
 from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.urls import path, include
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.decorators.http import require_safe
 
+# Konstanter Health-Body - einmal beim Import serialisiert statt pro Docker-Probe
+_HEALTH_BODY = b'{"status": "healthy", "service": "running-dinner-app", "version": "1.0.0"}'
 
+
+@require_safe
 def health_check(request):
     """Health check endpoint für Docker"""
-    return JsonResponse({
-        'status': 'healthy',
-        'service': 'running-dinner-app',
-        'version': '1.0.0'
-    })
+    return HttpResponse(_HEALTH_BODY, content_type='application/json')
 
 
 def home_view(request):
     """Home-View mit Template"""
+    from django.core.cache import cache
+    from django.db.models import Count
     from django.shortcuts import render
+    from events.cache_utils import HOME_UPCOMING_EVENTS_KEY, HOME_UPCOMING_EVENTS_TIMEOUT
     from events.models import Event
 
-    # Hole die nächsten 3 öffentlichen Events
-    upcoming_events = Event.objects.filter(
-        is_public=True,
-        status__in=['planning', 'registration_open', 'registration_closed']
-    ).order_by('event_date')[:3]
+    # Hole die nächsten 3 öffentlichen Events - für alle Besucher gleich, daher kurz gecacht
+    upcoming_events = cache.get_or_set(
+        HOME_UPCOMING_EVENTS_KEY,
+        lambda: list(Event.objects.filter(
+            is_public=True,
+            status__in=['planning', 'registration_open', 'registration_closed']
+        ).annotate(
+            registered_teams_count=Count('team_registrations')
+        ).order_by('event_date')[:3]),
+        HOME_UPCOMING_EVENTS_TIMEOUT
+    )
 
     context = {
         'upcoming_events': upcoming_events,